@@ -15,23 +15,497 @@ Features:
 - Batch processing support
 """
 
-import pdfplumber
 import re
 import csv
 import os
 import sys
 import argparse
+import atexit
+import contextlib
+import ctypes
+import hashlib
+import io
+import pickle
+from dataclasses import dataclass
 from datetime import datetime
-from collections import defaultdict
+from functools import lru_cache
+from collections import Counter, defaultdict, deque
+from operator import attrgetter
+from typing import Optional
+
+try:
+    import pymupdf
+except ImportError:
+    try:
+        import fitz as pymupdf  # PyMuPDF releases before 1.24
+    except ImportError:
+        pymupdf = None
+
+# pypdfium2 is installed along with pdfplumber, which uses it for rendering.
+# It is only imported when it is the backend actually used (see _import_pdfium).
+pdfium = pdfium_c = None
+
+def _import_pdfium():
+    """Import pypdfium2 on first use; return whether it is installed"""
+    global pdfium, pdfium_c
+    if pdfium is None:
+        try:
+            import pypdfium2 as pdfium
+            import pypdfium2.raw as pdfium_c
+        except ImportError:
+            return False
+    return True
+
+# Statement summary patterns, compiled once at import.
+# _SUMMARY_LINE_RE picks out every line that can feed a summary field in a
+# single scan of the PDF text, so the per-field checks only run on those lines.
+_SUMMARY_LINE_RE = re.compile(
+    r'^.*(?:Previous Balance|New Balance|Purchases|Payments|Payment Due Date|Opening/Closing Date'
+    r'|\w+ \d{1,2} - \w+ \d{1,2}, \d{4}|\d{2}/\d{2}/\d{2} - \d{2}/\d{2}/\d{2}).*$',
+    re.MULTILINE
+)
+_PREVIOUS_BALANCE_RE = re.compile(r'Previous Balance.*?\$?([\d,]+\.?\d{0,2})')
+_NEW_BALANCE_TOTAL_RE = re.compile(r'New Balance Total.*?\$?([\d,]+\.?\d{0,2})')
+_NEW_BALANCE_RE = re.compile(r'New Balance.*?\$?([\d,]+\.?\d{0,2})')
+_PURCHASES_ADJUSTMENTS_RE = re.compile(r'Purchases and Adjustments.*?\$?([\d,]+\.?\d{0,2})')
+_PURCHASES_RE = re.compile(r'Purchases[^\d]*[+\-]?\$?([\d,]+\.?\d{0,2})')
+# Lines mentioning Purchases that are not the Chase purchases total
+_PURCHASES_EXCLUDED_RE = re.compile(
+    'Total|%|important|Adjustments|new Purchases|consisting of Purchases|on Purchases'
+)
+_PAYMENTS_OTHER_CREDITS_RE = re.compile(r'Payments and Other Credits.*?-?\$?([\d,]+\.?\d{0,2})')
+_PAYMENTS_CREDITS_RE = re.compile(r'Payments/Credits.*?-?\$?([\d,]+\.?\d{0,2})')
+_PERIOD_BOA_RE = re.compile(r'\w+ \d{1,2} - \w+ \d{1,2}, \d{4}')
+_PERIOD_RE = re.compile(r'\d{2}/\d{2}/\d{2} - \d{2}/\d{2}/\d{2}')
+_PAYMENT_DUE_BOA_RE = re.compile(r'Payment Due Date\s+(\d{2}/\d{2}/\d{4})')
+_PAYMENT_DUE_CHASE_RE = re.compile(r'Payment Due Date[:\s]+(\d{2}/\d{2}/\d{2})')
+_OPEN_CLOSE_DATE_RE = re.compile(r'Opening/Closing Date\s+\d{2}/\d{2}/\d{2}\s*-\s*(\d{2}/\d{2}/\d{2})')
+
+# Bits for the summary fields parse_statement_summary has filled in
+_FOUND_PREVIOUS_BALANCE = 1
+_FOUND_NEW_BALANCE = 2
+_FOUND_PURCHASES = 4
+_FOUND_PAYMENTS = 8
+_FOUND_PERIOD = 16
+_FOUND_PAYMENT_DUE_DATE = 32
+_FOUND_ALL_SUMMARY_FIELDS = 63
+
+# Transaction line patterns
+# 0801 and 8635 transaction line. A bare amount matches with the optional $ empty,
+# so one pattern covers both the plain and the $-prefixed layout
+_TXN_0801_RE = re.compile(r'^(\d{2}/\d{2})\s+(.+?)\s+\$?([-]?\d{1,3}(?:,\d{3})*\.?\d{0,2})$')
+_TXN_5136_RE = re.compile(r'^(\d{2}/\d{2})\s+(.+?)\s+([-]?\d{1,3}(?:,\d{3})*\.?\d{0,2})$')
+_CARDHOLDER_RE = re.compile(r'^[A-Z][A-Z\s]+ RAJ$')
+# 1250: MM/DD MM/DD DESCRIPTION REFERENCE ACCOUNT AMOUNT
+_TXN_1250_RE = re.compile(r'^(\d{2}/\d{2})\s+(\d{2}/\d{2})\s+(.+?)\s+(\d+)\s+(\d{4})\s+([-]?\d{1,3}(?:,\d{3})*\.?\d{0,2})$')
+# 1250 statement period end, e.g. "July 25 - August 24, 2025"
+_PERIOD_END_1250_RE = re.compile(r'- (\w+) \d+, (\d{4})')
+
+# 0801 header and section lines, matched against the upper-cased line
+_HEADER_0801_RE = re.compile(
+    'ACCOUNT SUMMARY|PREVIOUS BALANCE|PAYMENTS|PURCHASES|BALANCE TRANSFERS|CASH ADVANCES'
+    '|FEES CHARGED|INTEREST CHARGED|NEW BALANCE|MINIMUM PAYMENT DUE|PAYMENT DUE DATE'
+)
+_SECTION_0801_RE = re.compile('TRANSACTIONS THIS CYCLE|FEES|INTEREST')
+
+# Header and footer lines of the other formats, matched case-sensitively
+# against the raw line
+_SKIP_5136_RE = re.compile('|'.join(map(re.escape, [
+    'Date of', 'Transaction', 'Merchant Name', '$ Amount',
+    'Account Summary', 'Previous Balance', 'New Balance',
+    'Minimum Payment', 'Payment Due', 'Interest',
+    'ACCOUNT SUMMARY', 'PREVIOUS BALANCE', 'NEW BALANCE'
+])))
+_SKIP_8635_RE = re.compile('|'.join(map(re.escape, [
+    'Date of', 'Transaction', 'Merchant Name', '$ Amount',
+    'ACCOUNT SUMMARY', 'ACCOUNT ACTIVITY', 'INTEREST CHARGES',
+    'Annual Percentage Rate', 'Balance Type', 'Year-to-date totals',
+    'Total fees charged', 'Total interest charged', 'TOTAL FEES FOR THIS PERIOD',
+    'TOTAL INTEREST FOR THIS PERIOD'
+])))
+_SKIP_1250_RE = re.compile('|'.join(map(re.escape, [
+    'Transaction Date', 'Posting Date', 'Description', 'Reference Number', 'Account Number', 'Amount', 'Total',
+    'TOTAL PAYMENTS', 'TOTAL PURCHASES', 'TOTAL INTEREST', 'TOTAL FEES',
+    '2025 Totals Year-to-Date', 'Interest Charge Calculation'
+])))
+# 8635 lines that mention PURCHASE without starting the purchase section
+_NOT_PURCHASE_SECTION_8635_RE = re.compile('Year-to-date|Total|INTEREST')
+
+# Transaction extractor method for each detected statement format;
+# anything unrecognised is parsed as 0801
+_FORMAT_EXTRACTORS = {
+    '0801': 'extract_0801_format_transactions',
+    '5136': 'extract_5136_format_transactions',
+    '8635': 'extract_8635_format_transactions',
+    '1250': 'extract_1250_format_transactions',
+}
+
+# Vendor key: everything before the first trailing number, store number or
+# company suffix, minus a trailing two-letter state code
+_VENDOR_KEY_RE = re.compile(r'(.*?)(?:\s+[A-Z]{2})?(?:\s+(?:\d|#\d|LLC|INC|CORP|CO).*)?', re.DOTALL)
+
+# Built-in merchant keywords, in priority order: when a merchant matches
+# keywords from several categories the earliest category wins.
+_CATEGORY_KEYWORDS = [
+    ('GAS/FUEL', ['SHELL', 'CHEVRON', 'EXXON', 'MOBIL', 'ARCO', 'BP ', 'COSTCO GAS', 'GAS']),
+    ('GROCERY', ['SAFEWAY', 'QFC', 'COSTCO WHSE', 'TARGET', 'WALMART']),
+    ('SHOPPING', ['AMAZON', 'AMZN']),
+    ('RESTAURANT', ['RESTAURANT', 'STARBUCKS', 'MCDONALD', 'SUBWAY', 'PIZZA']),
+    ('UTILITIES', ['ELECTRIC', 'WATER', 'GAS BILL', 'COMCAST', 'VERIZON']),
+    ('TRAVEL/DINING', ['UNITED', 'DELTA', 'AMERICAN AIR', 'SOUTHWEST', 'HOTEL']),
+    ('SUBSCRIPTIONS', ['NETFLIX', 'SPOTIFY', 'APPLE.COM', 'GOOGLE']),
+]
+_GROUP_TO_CAT = {f'cat{index}': category for index, (category, _) in enumerate(_CATEGORY_KEYWORDS)}
+# One alternation with a named group per category. Each branch looks ahead
+# for any of its keywords and branches are tried in table order, so
+# lastgroup names the highest-priority category present in the merchant.
+_CAT_RE = re.compile(
+    '|'.join(
+        f"(?=.*?(?:{'|'.join(re.escape(keyword) for keyword in keywords)}))(?P<cat{index}>)"
+        for index, (_, keywords) in enumerate(_CATEGORY_KEYWORDS)
+    ),
+    re.DOTALL
+)
+
+@lru_cache(maxsize=4096)
+def _auto_category(merchant):
+    """Built-in keyword category for a merchant string.
+
+    Statements repeat the same merchant strings (and directory mode sees them
+    again in every statement), so each distinct string is classified once.
+    """
+    match = _CAT_RE.match(merchant.upper())
+    return _GROUP_TO_CAT[match.lastgroup] if match else 'OTHER'
+
+# Parsed statements are cached per PDF. The key covers this file's source so
+# that a parser change never reuses results from the old parser.
+_PARSE_CACHE_DIR = os.path.join('~', '.cache', 'chase_analyzer')
+_CACHED_SUMMARY_FIELDS = (
+    'statement_previous_balance', 'statement_new_balance', 'statement_purchase_total',
+    'statement_payment_total', 'statement_period', 'payment_due_date'
+)
+with open(__file__, 'rb') as _source:
+    _SOURCE_DIGEST = hashlib.sha256(_source.read()).digest()
+
+def _parse_amount(amount_str):
+    """Statement amount text such as '1,234.56' or '-9.99' as a float"""
+    return float(amount_str.replace(',', ''))
+
+def _full_year_date(date_str):
+    """MM/DD/YY as MM/DD/YYYY, reading years before 50 as 20YY and the rest as 19YY"""
+    month, day, year = date_str.split('/')
+    year = int(year)
+    return f"{month}/{day}/{2000 + year if year < 50 else 1900 + year}"
+
+# PDF text extraction workers. Each worker process opens the PDF once and
+# then extracts whichever pages it is handed.
+_worker_pdf = None
+
+def _open_worker_pdf(pdf_path):
+    global _worker_pdf
+    import pdfplumber
+    _worker_pdf = pdfplumber.open(pdf_path)
+
+def _extract_worker_page(page_index):
+    return _worker_pdf.pages[page_index].extract_text()
+
+def _layout_page_words(words, y_tolerance=3):
+    """Page text from (x0, top, x1, bottom, text, ...) words, laid out the way pdfplumber lays it out.
+
+    The native extractors' own text output puts each text block on its own
+    lines, which splits labels from their amounts. Grouping words whose tops
+    are within y_tolerance points into one line and ordering them left to
+    right gives the merged lines the statement parsers expect.
+    """
+    lines = []
+    line_words = []
+    line_top = None
+    for word in sorted(words, key=lambda word: (word[1], word[0])):
+        if line_top is None or abs(word[1] - line_top) > y_tolerance:
+            if line_words:
+                lines.append(line_words)
+            line_words = [word]
+            line_top = word[1]
+        else:
+            line_words.append(word)
+    if line_words:
+        lines.append(line_words)
+    return "\n".join(" ".join(word[4] for word in sorted(words, key=lambda word: word[0])) for words in lines)
+
+def _pdfium_page_words(page, x_tolerance=3, y_tolerance=3):
+    """Words of a pypdfium2 page as (x0, top, x1, bottom, text) tuples.
+
+    pdfium only reports characters, so they are joined into words the way
+    pdfplumber does it: a word ends at whitespace or where the next character
+    is more than x_tolerance points away horizontally or y_tolerance points
+    vertically. Characters are read through the raw pdfium calls, which are
+    several times cheaper per character than the pypdfium2 helpers.
+    """
+    page_height = page.get_height()
+    textpage = page.get_textpage()
+    try:
+        handle = textpage.raw
+        rect = pdfium_c.FS_RECTF()
+        rect_ref = ctypes.byref(rect)
+        words = []
+        word = None
+        for index in range(pdfium_c.FPDFText_CountChars(handle)):
+            char = chr(pdfium_c.FPDFText_GetUnicode(handle, index))
+            if char.isspace() or char == '\0':
+                word = None
+                continue
+            pdfium_c.FPDFText_GetLooseCharBox(handle, index, rect_ref)
+            left, right = rect.left, rect.right
+            top, bottom = page_height - rect.top, page_height - rect.bottom
+            if word is not None and (left > word[2] + x_tolerance or right < word[0] - x_tolerance
+                                     or abs(top - word[1]) > y_tolerance):
+                word = None
+            if word is None:
+                word = [left, top, right, bottom, char]
+                words.append(word)
+            else:
+                word[2] = max(word[2], right)
+                word[4] += char
+        return words
+    finally:
+        textpage.close()
+
+def _aggregate_transactions(transactions):
+    """Per-category and per-cardholder [count, amount] pairs plus the grand total.
+
+    One pass feeds all three, so every report can share it. Both maps keep
+    first-seen order and every sum accumulates in statement order. Each pair
+    is a two-item list so an update is one dict probe and two index stores.
+    """
+    by_category = {}
+    by_cardholder = {}
+    grand_total = 0.0
+    for txn in transactions:
+        amount = txn.amount
+        grand_total += amount
+        
+        stats = by_category.get(txn.category)
+        if stats is None:
+            stats = by_category[txn.category] = [0, 0.0]
+        stats[0] += 1
+        stats[1] += amount
+        
+        stats = by_cardholder.get(txn.cardholder)
+        if stats is None:
+            stats = by_cardholder[txn.cardholder] = [0, 0.0]
+        stats[0] += 1
+        stats[1] += amount
+    
+    return {'by_category': by_category, 'by_cardholder': by_cardholder, 'grand_total': grand_total}
+
+def _process_pdf_job(job):
+    """Process one PDF in a directory-mode worker process.
+
+    Returns the console output and the master rules the file learned. The
+    parent prints outputs in file order and appends the rules, so workers
+    never write the master file themselves.
+    """
+    pdf_path, master_file, options = job
+    file_analyzer = EnhancedChaseStatementAnalyzer()
+    file_analyzer.pdf_backend = options['pdf_backend']
+    file_analyzer.use_cache = options['use_cache']
+    file_analyzer.parallel_pages = False  # Files are already spread across processes
+    file_analyzer.master_file = master_file
+    file_analyzer.defer_master_updates = True
+    
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        file_analyzer.process_pdf_file(pdf_path, create_csv=options['create_csv'], use_master=bool(master_file),
+                                       summary_only=options['summary_only'])
+    return output.getvalue(), file_analyzer.learned_master_categories
+
+# Category table row: name, count, amount, percentage of the table total
+_format_category_row = "{:<20} {:<8} ${:<14,.2f} {:<11.1f}%".format
+# Column headings shared by the category table and its MISC-adjusted version
+_CATEGORY_TABLE_HEADER = f"{'Category':<20} {'Count':<8} {'Amount':<15} {'% of Total':<12}"
+
+# Constant banners of the .categories file
+_CATEGORY_FILE_TITLE = "CHASE CREDIT CARD STATEMENT - CATEGORY ANALYSIS (PURCHASES ONLY)\n" + "=" * 80 + "\n"
+_CATEGORY_FILE_BREAKDOWN_HEADER = "CATEGORY BREAKDOWN\n" + "=" * 80 + "\n"
+
+def _category_rows(sorted_categories, total_amount):
+    """Formatted table rows for (category, [count, amount]) items.
+
+    The empty-total check is made once for the table rather than per row;
+    percentages keep the amount / total * 100 rounding of the report.
+    """
+    if total_amount > 0:
+        return [_format_category_row(category, count, amount, amount / total_amount * 100)
+                for category, (count, amount) in sorted_categories]
+    return [_format_category_row(category, count, amount, 0)
+            for category, (count, amount) in sorted_categories]
+
+def _resolve_master_file(master_file, pdf_path, cache=None):
+    """Master categorization file to use for pdf_path.
+
+    A master_file with a directory part is used as given. A bare file name
+    (categories.master when master_file is None) is used from the PDF's
+    directory if it exists there, otherwise as given, relative to the
+    current directory. cache, keyed by PDF directory, saves repeating the
+    lookup for every PDF in the same directory.
+    """
+    if master_file and os.path.basename(master_file) != master_file:
+        return master_file
+    
+    name = master_file or 'categories.master'
+    pdf_dir = os.path.dirname(pdf_path) or '.'
+    if cache is not None and pdf_dir in cache:
+        return cache[pdf_dir]
+    
+    dir_master_file = os.path.join(pdf_dir, name)
+    resolved = dir_master_file if os.path.exists(dir_master_file) else name
+    if cache is not None:
+        cache[pdf_dir] = resolved
+    return resolved
+
+def _write_lines(lines):
+    """Write report lines to stdout with a single write call"""
+    # Like print(), write nothing when there is no stdout (e.g. under pythonw)
+    if lines and sys.stdout is not None:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+def _get_max_workers(task_count):
+    """Worker processes worth starting for task_count independent tasks"""
+    return max(1, min(os.cpu_count() or 1, task_count))
+
+@dataclass(slots=True)
+class Transaction:
+    """One extracted statement line.
+
+    original_category is set once master categorization has run and holds
+    the category the built-in keywords assigned.
+    """
+    date: str
+    cardholder: str
+    merchant: str
+    amount: float
+    type: str
+    category: str
+    original_category: Optional[str] = None
+
+def _balancing_transaction(difference):
+    """SYSTEM ADJUSTMENT transaction cancelling difference (calculated minus statement total)"""
+    if difference > 0:
+        # We calculated more than statement - missing credits
+        return Transaction(
+            date='2025/01/01',
+            cardholder='SYSTEM ADJUSTMENT',
+            merchant='UNMATCHED CREDITS',
+            amount=-difference,
+            type='Credit',
+            category='OTHER'
+        )
+    # We calculated less than statement - missing purchases/fees
+    return Transaction(
+        date='2025/01/01',
+        cardholder='SYSTEM ADJUSTMENT',
+        merchant='UNMATCHED PURCHASES/FEES',
+        amount=-difference,
+        type='Purchase',
+        category='OTHER'
+    )
+
+# Master rules already loaded in this process, by master file path:
+# (st_mtime_ns, st_size) of the file, its rules and their MasterPatternMatcher.
+# Directory mode processes many PDFs against the same master file; appending
+# learned vendors changes the file's size, so the next PDF reloads it.
+_loaded_master_rules = {}
+
+def _master_file_signature(master_file):
+    """(st_mtime_ns, st_size) of master_file, or None if it cannot be read"""
+    try:
+        stat = os.stat(master_file)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class MasterPatternMatcher:
+    """Aho-Corasick automaton over master vendor patterns.
+
+    Finds the longest pattern contained in a merchant string in one pass over
+    the merchant, independent of how many patterns the master file holds.
+    Ties between equally long patterns go to the one listed first.
+    """
+    def __init__(self, master_categories):
+        self.master_categories = master_categories
+        goto = [{}]
+        best = [None]
+        
+        for order, (pattern, category) in enumerate(master_categories.items()):
+            if not pattern:
+                continue
+            node = 0
+            for char in pattern.upper():
+                child = goto[node].get(char)
+                if child is None:
+                    child = len(goto)
+                    goto[node][char] = child
+                    goto.append({})
+                    best.append(None)
+                node = child
+            rank = (len(pattern), -order)
+            if best[node] is None or rank > best[node][0]:
+                best[node] = (rank, pattern, category)
+        
+        # Breadth-first failure links; each node also inherits the best
+        # pattern that ends at its failure node (a suffix of this node)
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in goto[node].items():
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(char, 0)
+                inherited = best[fail[child]]
+                if inherited is not None and (best[child] is None or inherited[0] > best[child][0]):
+                    best[child] = inherited
+                queue.append(child)
+        
+        self._goto = goto
+        self._fail = fail
+        self._best = best
+
+    def best_match(self, merchant_upper):
+        """Return (pattern, category) for the longest pattern in merchant_upper, or None"""
+        goto, fail, best = self._goto, self._fail, self._best
+        node = 0
+        result = None
+        for char in merchant_upper:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            hit = best[node]
+            if hit is not None and (result is None or hit[0] > result[0]):
+                result = hit
+        return (result[1], result[2]) if result else None
 
 class EnhancedChaseStatementAnalyzer:
     def __init__(self):
         self.pdf_file = None
+        # Statement formats named anywhere in pdf_file's path; the display and
+        # verification steps pick their format-specific totals from it
+        self.pdf_file_formats = frozenset()
         self.pdf_text = None
         self.transactions = []
         self.master_file = None
         self.master_categories = {}
+        self.master_matcher = None
         self.new_vendors = set()
+        self._stats_cache = None
+        self._stats_source = None
+        self._stats_count = 0
+        self.pdf_backend = 'pymupdf' if pymupdf is not None else 'pypdfium2' if _import_pdfium() else 'pdfplumber'
+        self.use_cache = True
+        self.parallel_pages = True
+        self.defer_master_updates = False
+        self.learned_master_categories = {}
         
         # Statement summary fields
         self.statement_previous_balance = 0.0
@@ -42,110 +516,189 @@ class EnhancedChaseStatementAnalyzer:
         self.payment_due_date = ""
         
     def extract_pdf_content(self, pdf_path):
-        """Extract text content from PDF file using pdfplumber"""
+        """Extract text content from PDF file using PyMuPDF or pypdfium2, or pdfplumber as the fallback"""
+        backend = self.pdf_backend
+        if backend == 'pymupdf' and pymupdf is None:
+            backend = 'pypdfium2'
+        if backend == 'pypdfium2' and not _import_pdfium():
+            backend = 'pdfplumber'
+        
         try:
+            # MuPDF and pdfium are native code and an order of magnitude faster
+            # than pdfminer, so no worker processes are needed for them
+            if backend == 'pymupdf':
+                with pymupdf.open(pdf_path) as doc:
+                    page_texts = [_layout_page_words(page.get_text("words")) for page in doc]
+                return "".join(f"{page_text}\n" for page_text in page_texts if page_text)
+            
+            if backend == 'pypdfium2':
+                pdf = pdfium.PdfDocument(pdf_path)
+                try:
+                    page_texts = [_layout_page_words(_pdfium_page_words(page)) for page in pdf]
+                finally:
+                    pdf.close()
+                return "".join(f"{page_text}\n" for page_text in page_texts if page_text)
+            
+            # pdfplumber takes longer to import than the native backends take to
+            # extract a statement, so it is only loaded when it is actually used
+            import pdfplumber
             with pdfplumber.open(pdf_path) as pdf:
-                full_text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        full_text += page_text + "\n"
-                return full_text
+                page_count = len(pdf.pages)
+                max_workers = _get_max_workers(page_count) if self.parallel_pages else 1
+                if max_workers == 1:
+                    page_texts = [page.extract_text() for page in pdf.pages]
+            
+            if max_workers > 1:
+                # pdfminer layout analysis is CPU-bound Python, so spread pages
+                # across processes; map() keeps the results in page order
+                from concurrent.futures import ProcessPoolExecutor
+                with ProcessPoolExecutor(max_workers=max_workers, initializer=_open_worker_pdf,
+                                         initargs=(pdf_path,)) as executor:
+                    page_texts = list(executor.map(_extract_worker_page, range(page_count)))
+            
+            # Join once instead of growing one string page by page
+            return "".join(f"{page_text}\n" for page_text in page_texts if page_text)
         except Exception as e:
             print(f"Error extracting PDF content: {e}")
             return None
     
+    def get_parse_cache_path(self, pdf_path):
+        """Cache file for the parsed transactions and summary of pdf_path"""
+        digest = hashlib.sha256(_SOURCE_DIGEST)
+        with open(pdf_path, 'rb') as file:
+            digest.update(file.read())
+        # Format detection looks at the path, so it is part of the key too
+        digest.update(f"\0{pdf_path}\0{self.pdf_backend}".encode())
+        return os.path.join(os.path.expanduser(_PARSE_CACHE_DIR), f"{digest.hexdigest()}.pkl")
+
+    def load_parse_cache(self, cache_path):
+        """Restore transactions and summary fields from cache_path, or None on a miss"""
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            with open(cache_path, 'rb') as file:
+                transactions, summary = pickle.load(file)
+        except Exception as e:
+            print(f"   ⚠️  Warning: Could not read parse cache: {e}")
+            return None
+        for field in _CACHED_SUMMARY_FIELDS:
+            setattr(self, field, summary[field])
+        return transactions
+
+    def save_parse_cache(self, cache_path, transactions):
+        """Store transactions and summary fields in cache_path"""
+        summary = {field: getattr(self, field) for field in _CACHED_SUMMARY_FIELDS}
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            # Write to a temporary file first so a concurrent reader never sees a partial pickle
+            temp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as file:
+                pickle.dump((transactions, summary), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except Exception as e:
+            print(f"   ⚠️  Warning: Could not write parse cache: {e}")
+
     def parse_statement_summary(self, pdf_text):
         """Parse statement summary information from PDF text"""
-        lines = pdf_text.split('\n')
-        
-        if not getattr(self, 'summary_only', False):
-            print(f"   📋 Looking for statement summary in {len(lines)} lines...")
-        
-        for line in lines:
-            line = line.strip()
+        verbose = not getattr(self, 'summary_only', False)
+        if verbose:
+            line_count = pdf_text.count('\n') + 1
+            print(f"   📋 Looking for statement summary in {line_count} lines...")
+        
+        # Only lines mentioning a summary field are worth checking
+        found = 0
+        for line_match in _SUMMARY_LINE_RE.finditer(pdf_text):
+            line = line_match.group(0).strip()
             
             # Previous Balance (Chase and Bank of America formats)
             if 'Previous Balance' in line:
-                balance_match = re.search(r'Previous Balance.*?\$?([\d,]+\.?\d{0,2})', line)
+                balance_match = _PREVIOUS_BALANCE_RE.search(line)
                 if balance_match and balance_match.group(1) and balance_match.group(1).strip():
-                    self.statement_previous_balance = float(balance_match.group(1).replace(',', ''))
+                    self.statement_previous_balance = _parse_amount(balance_match.group(1))
+                    found |= _FOUND_PREVIOUS_BALANCE
             
             # New Balance Total (Bank of America) or New Balance (Chase)
             elif 'New Balance Total' in line and line.startswith(('New Balance Total', 'Account Summary/Payment Information New Balance Total')):
-                balance_match = re.search(r'New Balance Total.*?\$?([\d,]+\.?\d{0,2})', line)
+                balance_match = _NEW_BALANCE_TOTAL_RE.search(line)
                 if balance_match and balance_match.group(1) and balance_match.group(1).strip():
                     try:
-                        self.statement_new_balance = float(balance_match.group(1).replace(',', ''))
+                        self.statement_new_balance = _parse_amount(balance_match.group(1))
+                        found |= _FOUND_NEW_BALANCE
                     except ValueError:
                         # Debug output for troubleshooting
-                        if not getattr(self, 'summary_only', False):
+                        if verbose:
                             print(f"DEBUG: Failed to parse New Balance Total from line: {repr(line)}")
                             print(f"DEBUG: Match group 1: {repr(balance_match.group(1))}")
                         continue
             elif 'New Balance' in line and 'Total' not in line:
-                balance_match = re.search(r'New Balance.*?\$?([\d,]+\.?\d{0,2})', line)
+                balance_match = _NEW_BALANCE_RE.search(line)
                 if balance_match and balance_match.group(1) and balance_match.group(1).strip():
-                    self.statement_new_balance = float(balance_match.group(1).replace(',', ''))
+                    self.statement_new_balance = _parse_amount(balance_match.group(1))
+                    found |= _FOUND_NEW_BALANCE
             
             # Purchases and Adjustments (Bank of America) or Purchases (Chase)
             elif 'Purchases and Adjustments' in line and line.startswith(('Purchases and Adjustments', 'Account Summary/Payment Information')):
-                purchase_match = re.search(r'Purchases and Adjustments.*?\$?([\d,]+\.?\d{0,2})', line)
+                purchase_match = _PURCHASES_ADJUSTMENTS_RE.search(line)
                 if purchase_match and purchase_match.group(1) and purchase_match.group(1).strip():
-                    self.statement_purchase_total = float(purchase_match.group(1).replace(',', ''))
-            elif 'Purchases' in line and 'Total' not in line and '%' not in line and 'important' not in line and 'Adjustments' not in line and 'new Purchases' not in line and 'consisting of Purchases' not in line and 'on Purchases' not in line:
-                purchase_match = re.search(r'Purchases[^\d]*[+\-]?\$?([\d,]+\.?\d{0,2})', line)
-                if purchase_match and purchase_match.group(1) and purchase_match.group(1).replace(',', '').replace('.', '').isdigit() and len(purchase_match.group(1).replace(',', '').replace('.', '')) >= 2:
+                    self.statement_purchase_total = _parse_amount(purchase_match.group(1))
+                    found |= _FOUND_PURCHASES
+            elif 'Purchases' in line and not _PURCHASES_EXCLUDED_RE.search(line):
+                purchase_match = _PURCHASES_RE.search(line)
+                digits = purchase_match.group(1).replace(',', '').replace('.', '') if purchase_match else ''
+                if digits.isdigit() and len(digits) >= 2:
                     # Only accept if the amount makes sense (at least 2 digits, not just "1")
-                    amount = float(purchase_match.group(1).replace(',', ''))
+                    amount = _parse_amount(purchase_match.group(1))
                     if amount >= 0.01:  # Reasonable minimum
                         self.statement_purchase_total = amount
+                        found |= _FOUND_PURCHASES
             
             # Payments and Other Credits (Bank of America) or Payments/Credits (Chase)
             elif 'Payments and Other Credits' in line:
-                payment_match = re.search(r'Payments and Other Credits.*?-?\$?([\d,]+\.?\d{0,2})', line)
+                payment_match = _PAYMENTS_OTHER_CREDITS_RE.search(line)
                 if payment_match and payment_match.group(1) and payment_match.group(1).strip():
-                    self.statement_payment_total = float(payment_match.group(1).replace(',', ''))
+                    self.statement_payment_total = _parse_amount(payment_match.group(1))
+                    found |= _FOUND_PAYMENTS
             elif 'Payments' in line and 'Credits' in line and 'Other' not in line:
-                payment_match = re.search(r'Payments/Credits.*?-?\$?([\d,]+\.?\d{0,2})', line)
+                payment_match = _PAYMENTS_CREDITS_RE.search(line)
                 if payment_match and payment_match.group(1) and payment_match.group(1).strip():
-                    self.statement_payment_total = float(payment_match.group(1).replace(',', ''))
+                    self.statement_payment_total = _parse_amount(payment_match.group(1))
+                    found |= _FOUND_PAYMENTS
             
             # Statement period - Bank of America format (December 25 - January 24, 2025) or Chase format
-            elif re.match(r'\w+ \d{1,2} - \w+ \d{1,2}, \d{4}', line):
+            elif _PERIOD_BOA_RE.match(line):
                 self.statement_period = line
-            elif re.match(r'\d{2}/\d{2}/\d{2} - \d{2}/\d{2}/\d{2}', line):
+                found |= _FOUND_PERIOD
+            elif _PERIOD_RE.match(line):
                 self.statement_period = line
+                found |= _FOUND_PERIOD
             
             # Payment Due Date - Bank of America format (MM/DD/YYYY)
             elif 'Payment Due Date' in line:
-                payment_due_match = re.search(r'Payment Due Date\s+(\d{2}/\d{2}/\d{4})', line)
+                payment_due_match = _PAYMENT_DUE_BOA_RE.search(line)
                 if payment_due_match:
                     self.payment_due_date = payment_due_match.group(1)
+                    found |= _FOUND_PAYMENT_DUE_DATE
             
             # Payment Due Date - Chase 0801 format (MM/DD/YY)
             elif 'Payment Due Date' in line and not self.payment_due_date:
-                payment_due_match_chase = re.search(r'Payment Due Date[:\s]+(\d{2}/\d{2}/\d{2})', line)
+                payment_due_match_chase = _PAYMENT_DUE_CHASE_RE.search(line)
                 if payment_due_match_chase:
                     # Convert 2-digit year to 4-digit year
-                    date_parts = payment_due_match_chase.group(1).split('/')
-                    year_2digit = int(date_parts[2])
-                    year_4digit = 2000 + year_2digit if year_2digit < 50 else 1900 + year_2digit
-                    self.payment_due_date = f"{date_parts[0]}/{date_parts[1]}/{year_4digit}"
+                    self.payment_due_date = _full_year_date(payment_due_match_chase.group(1))
+                    found |= _FOUND_PAYMENT_DUE_DATE
             
             # Opening/Closing Date - Chase 0801 and 8635 formats for statement period
             elif 'Opening/Closing Date' in line:
-                closing_date_match = re.search(r'Opening/Closing Date\s+\d{2}/\d{2}/\d{2}\s*-\s*(\d{2}/\d{2}/\d{2})', line)
+                closing_date_match = _OPEN_CLOSE_DATE_RE.search(line)
                 if closing_date_match:
-                    # Store the closing date for 0801 and 8635 formats
-                    closing_date = closing_date_match.group(1)
-                    # Convert to full date format
-                    date_parts = closing_date.split('/')
-                    year_2digit = int(date_parts[2])
-                    year_4digit = 2000 + year_2digit if year_2digit < 50 else 1900 + year_2digit
-                    self.statement_period = f"{date_parts[0]}/{date_parts[1]}/{year_4digit}"
-        
-        if not getattr(self, 'summary_only', False):
+                    # Store the closing date for 0801 and 8635 formats, as a full date
+                    self.statement_period = _full_year_date(closing_date_match.group(1))
+                    found |= _FOUND_PERIOD
+            
+            if found == _FOUND_ALL_SUMMARY_FIELDS:
+                break
+        
+        if verbose:
             print(f"     Previous Balance: ${self.statement_previous_balance:,.2f}")
             print(f"     Payments/Credits: $-{self.statement_payment_total:,.2f}")
             print(f"     Purchases: ${self.statement_purchase_total:,.2f}")
@@ -159,11 +712,11 @@ class EnhancedChaseStatementAnalyzer:
         from datetime import datetime
         
         # For 1250 format (Bank of America), use statement period end date to determine statement month
-        if hasattr(self, 'pdf_file') and '1250' in self.pdf_file:
+        if '1250' in self.pdf_file_formats:
             try:
                 if self.statement_period:
                     # Extract ending month from statement period (e.g., "July 25 - August 24, 2025")
-                    period_match = re.search(r'- (\w+) \d+, (\d{4})', self.statement_period)
+                    period_match = _PERIOD_END_1250_RE.search(self.statement_period)
                     if period_match:
                         month_name = period_match.group(1)
                         year = period_match.group(2)
@@ -172,7 +725,7 @@ class EnhancedChaseStatementAnalyzer:
                 pass
         
         # For 0801, 5136, and 8635 formats (Chase), use closing date to determine statement month
-        elif hasattr(self, 'pdf_file') and ('0801' in self.pdf_file or '5136' in self.pdf_file or '8635' in self.pdf_file):
+        elif self.pdf_file_formats:  # 0801, 5136 or 8635
             try:
                 if self.statement_period:
                     # statement_period contains the closing date in MM/DD/YYYY format
@@ -184,34 +737,18 @@ class EnhancedChaseStatementAnalyzer:
         # For other formats, use statement period as is
         return self.statement_period
 
-    def categorize_transaction(self, merchant, amount):
+    def categorize_transaction(self, merchant: str, amount: float) -> str:
         """Automatically categorize transaction based on merchant name (purchases only)"""
-        merchant_upper = merchant.upper()
-        
-        # Basic categorization patterns
-        if any(gas in merchant_upper for gas in ['SHELL', 'CHEVRON', 'EXXON', 'MOBIL', 'ARCO', 'BP ', 'COSTCO GAS', 'GAS']):
-            return 'GAS/FUEL'
-        elif any(grocery in merchant_upper for grocery in ['SAFEWAY', 'QFC', 'COSTCO WHSE', 'TARGET', 'WALMART']):
-            return 'GROCERY'
-        elif any(amazon in merchant_upper for amazon in ['AMAZON', 'AMZN']):
-            return 'SHOPPING'
-        elif any(dining in merchant_upper for dining in ['RESTAURANT', 'STARBUCKS', 'MCDONALD', 'SUBWAY', 'PIZZA']):
-            return 'RESTAURANT'
-        elif any(util in merchant_upper for util in ['ELECTRIC', 'WATER', 'GAS BILL', 'COMCAST', 'VERIZON']):
-            return 'UTILITIES'
-        elif any(travel in merchant_upper for travel in ['UNITED', 'DELTA', 'AMERICAN AIR', 'SOUTHWEST', 'HOTEL']):
-            return 'TRAVEL/DINING'
-        elif any(sub in merchant_upper for sub in ['NETFLIX', 'SPOTIFY', 'APPLE.COM', 'GOOGLE']):
-            return 'SUBSCRIPTIONS'
-        else:
-            return 'OTHER'
+        return _auto_category(merchant)
 
-    def detect_statement_format(self, lines):
+    def detect_statement_format(self, lines: list[str]) -> str:
         """Detect which Chase statement format we're dealing with by checking Account Number"""
-        # Look for "Account Number:" in first 50 lines and extract last 4 digits
-        sample_lines = lines[:50]
+        # Look for "Account Number:" in first 50 lines and extract last 4 digits.
+        # The same pass records the older header markers used as a fallback
+        # when no Account Number line names a known account.
+        has_credits_header = has_purchase = has_date_of_transaction = has_transactions_this_cycle = False
         
-        for line in sample_lines:
+        for line in lines[:50]:
             if 'Account Number:' in line:
                 # Extract the account number and get last 4 digits
                 if '5136' in line:
@@ -222,94 +759,70 @@ class EnhancedChaseStatementAnalyzer:
                     return '8635'
                 elif '1250' in line:
                     return '1250'
-        
-        # Fallback to old detection method if Account Number not found
-        sample_text = '\n'.join(sample_lines).upper()
+            
+            line_upper = line.upper()
+            has_credits_header = has_credits_header or 'PAYMENTS AND OTHER CREDITS' in line_upper
+            has_purchase = has_purchase or 'PURCHASE' in line_upper
+            has_date_of_transaction = has_date_of_transaction or 'DATE OF TRANSACTION' in line_upper
+            has_transactions_this_cycle = has_transactions_this_cycle or 'TRANSACTIONS THIS CYCLE' in line_upper
         
         # 8635 format indicators
-        if 'PAYMENTS AND OTHER CREDITS' in sample_text and 'PURCHASE' in sample_text:
+        if has_credits_header and has_purchase:
             return '8635'
         
         # 5136 format indicators
-        if 'DATE OF TRANSACTION' in sample_text:
+        if has_date_of_transaction:
             return '5136'
         
         # 0801 format indicators  
-        if 'TRANSACTIONS THIS CYCLE' in sample_text:
+        if has_transactions_this_cycle:
             return '0801'
         
         # Default to trying 5136 format first (newer format)
         return '5136'
 
-    def extract_transactions_from_pdf(self, pdf_text):
-        """Extract transactions from PDF based on detected format"""
-        lines = pdf_text.split('\n')
-        
-        if not getattr(self, 'summary_only', False):
+    def extract_transactions_from_pdf(self, lines: list[str]) -> list[Transaction]:
+        """Extract transactions from the PDF text lines based on detected format"""
+        verbose = not getattr(self, 'summary_only', False)
+        if verbose:
             print(f"   🔍 Extracting transactions from PDF (excluding payments)...")
         
         # Detect format
         format_type = self.detect_statement_format(lines)
-        if not getattr(self, 'summary_only', False):
+        if verbose:
             print(f"   🔍 Detected {format_type} format statement")
         
-        if format_type == '5136':
-            transactions = self.extract_5136_format_transactions(lines)
-        elif format_type == '8635':
-            transactions = self.extract_8635_format_transactions(lines)
-        elif format_type == '1250':
-            transactions = self.extract_1250_format_transactions(lines)
-        else:
-            transactions = self.extract_0801_format_transactions(lines)
+        extractor = getattr(self, _FORMAT_EXTRACTORS.get(format_type, 'extract_0801_format_transactions'))
+        transactions = extractor(lines)
         
-        if not getattr(self, 'summary_only', False):
+        if verbose:
             print(f"   ✅ Extracted {len(transactions)} transactions")
         
         return transactions
 
-    def extract_0801_format_transactions(self, lines):
+    def extract_0801_format_transactions(self, lines: list[str]) -> list[Transaction]:
         """Extract transactions from 0801 format (traditional format with cardholder groupings)"""
-        all_transactions = []
-        current_cardholder = None
-        pending_transactions = []
-        
-        # Transaction patterns for 0801 format
-        transaction_patterns = [
-            r'^(\d{2}/\d{2})\s+(.+?)\s+([-]?\d{1,3}(?:,\d{3})*\.?\d{0,2})$',
-            r'^(\d{2}/\d{2})\s+(.+?)\s+\$?([-]?\d{1,3}(?:,\d{3})*\.?\d{0,2})$'
-        ]
+        verbose = not getattr(self, 'summary_only', False)
+        # Progress messages are collected and written in one go when the extraction is done
+        messages: list[str] = []
+        all_transactions: list[Transaction] = []
+        current_cardholder: Optional[str] = None
+        pending_transactions: list[tuple[str, str, float]] = []
         
         for line in lines:
             line = line.strip()
             if not line:
                 continue
+            line_upper = line.upper()
             
             # Skip header lines
-            if any(header in line.upper() for header in [
-                'ACCOUNT SUMMARY', 'PREVIOUS BALANCE', 'PAYMENTS', 'PURCHASES', 
-                'BALANCE TRANSFERS', 'CASH ADVANCES', 'FEES CHARGED', 'INTEREST CHARGED',
-                'NEW BALANCE', 'MINIMUM PAYMENT DUE', 'PAYMENT DUE DATE'
-            ]):
+            if _HEADER_0801_RE.search(line_upper):
                 continue
             
             # Detect cardholder sections
-            if re.match(r'^[A-Z][A-Z\s]+ RAJ$', line) and 'ACCOUNT' not in line:
+            if _CARDHOLDER_RE.match(line) and 'ACCOUNT' not in line:
                 # Process any pending transactions for previous cardholder
-                if pending_transactions and current_cardholder:
-                    for txn_data in pending_transactions:
-                        date_str, merchant, amount = txn_data
-                        category = self.categorize_transaction(merchant, amount)
-                        
-                        # Only include purchases (payments already filtered out above)
-                        transaction = {
-                            'date': f"2025/{date_str}",
-                            'cardholder': current_cardholder,
-                            'merchant': merchant.strip(),
-                            'amount': amount,
-                            'type': 'Purchase',
-                            'category': category
-                        }
-                        all_transactions.append(transaction)
+                self._flush_pending_transactions(pending_transactions, current_cardholder, all_transactions)
                 
                 # Set new cardholder and clear pending
                 current_cardholder = line.strip()
@@ -317,166 +830,178 @@ class EnhancedChaseStatementAnalyzer:
                 continue
             
             # Skip section headers
-            if any(section in line.upper() for section in [
-                'TRANSACTIONS THIS CYCLE', 'FEES', 'INTEREST'
-            ]):
+            if _SECTION_0801_RE.search(line_upper):
                 continue
             
             # Check if this line contains "TRANSACTIONS THIS CYCLE" followed by transactions
-            if 'TRANSACTIONS THIS CYCLE' in line.upper():
+            if 'TRANSACTIONS THIS CYCLE' in line_upper:
                 # Process remaining text on this line for transactions
-                remaining_text = line[line.upper().find('TRANSACTIONS THIS CYCLE') + len('TRANSACTIONS THIS CYCLE'):].strip()
-                if remaining_text:
-                    # Try to parse transaction from remaining text
-                    for pattern in transaction_patterns:
-                        match = re.match(pattern, remaining_text)
-                        if match:
-                            try:
-                                date_str = match.group(1)
-                                merchant = match.group(2).strip()
-                                amount_str = match.group(3).replace('$', '').replace(',', '')
-                                
-                                if len(merchant) < 3:
-                                    continue
-                                    
-                                amount = float(amount_str)
-                                
-                                if amount < 0 or 'payment' in merchant.lower():
-                                    if not getattr(self, 'summary_only', False):
-                                        print(f"     Skipping payment: {merchant} ${amount}")
-                                    break
-                                
-                                category = self.categorize_transaction(merchant, amount)
-                                
-                                # Only include purchases (payments already filtered out above)
-                                transaction = {
-                                    'date': f"2025/{date_str}",
-                                    'cardholder': current_cardholder,
-                                    'merchant': merchant.strip(),
-                                    'amount': amount,
-                                    'type': 'Purchase',
-                                    'category': category
-                                }
-                                all_transactions.append(transaction)
-                                
-                                # Clear pending transactions
-                                pending_transactions = []
-                                break
-                            except (ValueError, IndexError):
-                                continue
-                continue
-            
-            # Try to match transaction patterns
-            transaction_found = False
-            for pattern in transaction_patterns:
-                match = re.match(pattern, line)
+                remaining_text = line[line_upper.find('TRANSACTIONS THIS CYCLE') + len('TRANSACTIONS THIS CYCLE'):].strip()
+                # Try to parse transaction from remaining text
+                match = _TXN_0801_RE.match(remaining_text) if remaining_text else None
                 if match:
                     try:
                         date_str = match.group(1)
                         merchant = match.group(2).strip()
-                        amount_str = match.group(3).replace('$', '').replace(',', '')
                         
-                        # Skip if merchant is too short or looks like a header
-                        if len(merchant) < 3 or merchant.upper() in ['TOTAL', 'SUBTOTAL']:
+                        if len(merchant) < 3:
                             continue
                             
-                        amount = float(amount_str)
+                        amount = _parse_amount(match.group(3))
                         
-                        # Skip payments - only include purchases
-                        if amount < 0 or 'payment' in merchant.lower() or 'thank you' in merchant.lower():
-                            if not getattr(self, 'summary_only', False):
-                                print(f"     Skipping payment: {merchant} ${amount}")
-                            transaction_found = True
-                            break
+                        if amount < 0 or 'payment' in merchant.lower():
+                            if verbose:
+                                messages.append(f"     Skipping payment: {merchant} ${amount}")
+                            continue
                         
-                        # Add to pending transactions (will be assigned to cardholder later)
-                        pending_transactions.append((date_str, merchant, amount))
-                        transaction_found = True
-                        break
+                        category = self.categorize_transaction(merchant, amount)
                         
+                        # Only include purchases (payments already filtered out above)
+                        transaction = Transaction(
+                            date=f"2025/{date_str}",
+                            cardholder=current_cardholder,
+                            merchant=merchant.strip(),
+                            amount=amount,
+                            type='Purchase',
+                            category=category
+                        )
+                        all_transactions.append(transaction)
+                        
+                        # Clear pending transactions
+                        pending_transactions = []
                     except (ValueError, IndexError):
-                        continue
-            
-            if transaction_found:
+                        pass
                 continue
+            
+            # Try to match the transaction pattern
+            match = _TXN_0801_RE.match(line)
+            if match:
+                try:
+                    date_str = match.group(1)
+                    merchant = match.group(2).strip()
+                    
+                    # Skip if merchant is too short or looks like a header
+                    if len(merchant) < 3 or merchant.upper() in ['TOTAL', 'SUBTOTAL']:
+                        continue
+                        
+                    amount = _parse_amount(match.group(3))
+                    
+                    # Skip payments - only include purchases
+                    if amount < 0 or 'payment' in merchant.lower() or 'thank you' in merchant.lower():
+                        if verbose:
+                            messages.append(f"     Skipping payment: {merchant} ${amount}")
+                        continue
+                    
+                    # Add to pending transactions (will be assigned to cardholder later)
+                    pending_transactions.append((date_str, merchant, amount))
+                    
+                except (ValueError, IndexError):
+                    continue
         
         # Assign any remaining pending transactions to last cardholder
-        if pending_transactions and current_cardholder:
-            for txn_data in pending_transactions:
-                date_str, merchant, amount = txn_data
-                category = self.categorize_transaction(merchant, amount)
-                
-                # Only include purchases (payments already filtered out above)
-                transaction = {
-                    'date': f"2025/{date_str}",
-                    'cardholder': current_cardholder,
-                    'merchant': merchant.strip(),
-                    'amount': amount,
-                    'type': 'Purchase',
-                    'category': category
-                }
-                all_transactions.append(transaction)
+        self._flush_pending_transactions(pending_transactions, current_cardholder, all_transactions)
                 
+        _write_lines(messages)
         return all_transactions
 
-    def extract_5136_format_transactions(self, lines):
+    def _flush_pending_transactions(self, pending_transactions: list[tuple[str, str, float]],
+                                    cardholder: Optional[str], all_transactions: list[Transaction]) -> None:
+        """Append pending (date, merchant, amount) purchases to all_transactions under cardholder"""
+        if not cardholder:
+            return
+        for date_str, merchant, amount in pending_transactions:
+            # Only include purchases (payments already filtered out before queueing)
+            all_transactions.append(Transaction(
+                date=f"2025/{date_str}",
+                cardholder=cardholder,
+                merchant=merchant.strip(),
+                amount=amount,
+                type='Purchase',
+                category=self.categorize_transaction(merchant, amount)
+            ))
+
+    def _include_unmatched_credits(self, credits_to_include: list[Transaction], all_transactions: list[Transaction],
+                                   messages: Optional[list[str]]) -> None:
+        """Append each credit to all_transactions unless a purchase offsets it.
+
+        A purchase offsets a credit when it has the credit's absolute amount and
+        its merchant contains the first word of the credit's merchant (both
+        UBER, APPLE, etc.). Purchases are indexed by amount once, so each credit
+        only looks at the purchases with its own amount. The decision for each
+        credit is appended to messages unless it is None.
+        """
+        purchase_merchants_by_amount = defaultdict(list)
+        for txn in all_transactions:
+            if txn.type == 'Purchase':
+                purchase_merchants_by_amount[txn.amount].append(txn.merchant.upper())
+        
+        for credit in credits_to_include:
+            merchant = credit.merchant
+            credit_words = merchant.upper().split()
+            credit_base = credit_words[0] if credit_words else ''
+            
+            # Check if there's a corresponding purchase with the same amount and a similar merchant
+            if credit_base and any(credit_base in purchase_merchant
+                                   for purchase_merchant in purchase_merchants_by_amount.get(abs(credit.amount), ())):
+                if messages is not None:
+                    messages.append(f"     Excluding credit {merchant} ${credit.amount} - has offsetting purchase")
+                continue
+            
+            # Only include credit if it doesn't have an offsetting purchase
+            all_transactions.append(credit)
+            if messages is not None:
+                messages.append(f"     Including credit: {merchant} ${credit.amount} → {credit.category}")
+
+    def extract_5136_format_transactions(self, lines: list[str]) -> list[Transaction]:
         """Extract transactions from new 5136 format (columnar layout) - simplified approach"""
-        all_transactions = []
-        credits_to_include = []
+        verbose = not getattr(self, 'summary_only', False)
+        # Progress messages are collected and written in one go when the extraction is done
+        messages: list[str] = []
+        all_transactions: list[Transaction] = []
+        credits_to_include: list[Transaction] = []
         current_cardholder = "SUMATHI RAJ"  # Default for 5136 format since no cardholder groupings
         in_fees_section = False
         in_credits_section = False
         
-        # Simple regex for 5136 format: MM/DD MERCHANT AMOUNT
-        transaction_pattern = r'^(\d{2}/\d{2})\s+(.+?)\s+([-]?\d{1,3}(?:,\d{3})*\.?\d{0,2})$'
-        
-        # Skip patterns to avoid processing headers/footers
-        skip_patterns = [
-            'Date of', 'Transaction', 'Merchant Name', '$ Amount',
-            'Account Summary', 'Previous Balance', 'New Balance',
-            'Minimum Payment', 'Payment Due', 'Interest',
-            'ACCOUNT SUMMARY', 'PREVIOUS BALANCE', 'NEW BALANCE'
-        ]
-        
         # First pass: collect all transactions
         for line in lines:
             line = line.strip()
             if not line:
                 continue
+            line_upper = line.upper()
             
             # Check if we're entering or leaving the FEES CHARGED section
-            if 'FEES CHARGED' in line.upper():
+            if 'FEES CHARGED' in line_upper:
                 in_fees_section = True
                 continue
-            elif in_fees_section and ('INTEREST CHARGES' in line.upper() or 'TOTAL FEES FOR THIS PERIOD' in line.upper()):
+            elif in_fees_section and ('INTEREST CHARGES' in line_upper or 'TOTAL FEES FOR THIS PERIOD' in line_upper):
                 in_fees_section = False
                 continue
             
             # Check if we're entering or leaving the PAYMENTS AND OTHER CREDITS section
-            if 'PAYMENTS AND OTHER CREDITS' in line.upper():
+            if 'PAYMENTS AND OTHER CREDITS' in line_upper:
                 in_credits_section = True
                 continue
-            elif in_credits_section and ('PURCHASE' in line.upper() or 'TOTAL CREDITS' in line.upper() or 'INTEREST CHARGES' in line.upper()):
+            elif in_credits_section and ('PURCHASE' in line_upper or 'TOTAL CREDITS' in line_upper or 'INTEREST CHARGES' in line_upper):
                 in_credits_section = False
                 continue
             
             # Skip header and footer lines (but not TOTAL FEES line which we want to skip anyway)
-            if any(skip in line for skip in skip_patterns) or 'TOTAL FEES' in line.upper():
+            if _SKIP_5136_RE.search(line) or 'TOTAL FEES' in line_upper:
                 continue
             
-            # Try to match transaction pattern
-            match = re.match(transaction_pattern, line)
+            # Try to match transaction pattern (MM/DD MERCHANT AMOUNT)
+            match = _TXN_5136_RE.match(line)
             if match:
                 try:
                     date_str = match.group(1)
                     merchant = match.group(2).strip()
-                    amount_str = match.group(3).replace(',', '')
                     
                     # Skip if merchant is too short or looks like a header/total
                     if len(merchant) < 3 or merchant.upper() in ['TOTAL', 'SUBTOTAL', 'BALANCE']:
                         continue
                     
-                    amount = float(amount_str)
+                    amount = _parse_amount(match.group(3))
                     
                     # Handle credits section differently
                     if in_credits_section:
@@ -485,19 +1010,19 @@ class EnhancedChaseStatementAnalyzer:
                             # This is a credit - store for later processing
                             if 'payment' in merchant.lower() or 'thank you' in merchant.lower():
                                 # Skip payments even if they're negative
-                                if not getattr(self, 'summary_only', False):
-                                    print(f"     Skipping payment: {merchant} ${amount}")
+                                if verbose:
+                                    messages.append(f"     Skipping payment: {merchant} ${amount}")
                                 continue
                             else:
                                 # Store credit for later analysis
-                                credits_to_include.append({
-                                    'date': f"2025/{date_str}",
-                                    'cardholder': current_cardholder,
-                                    'merchant': merchant,
-                                    'amount': amount,
-                                    'type': 'Credit',
-                                    'category': self.categorize_transaction(merchant, abs(amount))
-                                })
+                                credits_to_include.append(Transaction(
+                                    date=f"2025/{date_str}",
+                                    cardholder=current_cardholder,
+                                    merchant=merchant,
+                                    amount=amount,
+                                    type='Credit',
+                                    category=self.categorize_transaction(merchant, abs(amount))
+                                ))
                         else:
                             # Positive amount in credits section - should be rare, skip for now
                             continue
@@ -505,8 +1030,8 @@ class EnhancedChaseStatementAnalyzer:
                         # Regular transaction processing (purchases and fees)
                         # Skip payments (negative amounts or payment keywords)
                         if amount < 0 or 'payment' in merchant.lower() or 'thank you' in merchant.lower():
-                            if not getattr(self, 'summary_only', False):
-                                print(f"     Skipping payment: {merchant} ${amount}")
+                            if verbose:
+                                messages.append(f"     Skipping payment: {merchant} ${amount}")
                             continue
                         
                         # Determine transaction type and category
@@ -519,14 +1044,14 @@ class EnhancedChaseStatementAnalyzer:
                             transaction_type = 'Purchase' 
                             category = self.categorize_transaction(merchant, amount)
                         
-                        transaction = {
-                            'date': f"2025/{date_str}",
-                            'cardholder': current_cardholder,
-                            'merchant': merchant,
-                            'amount': amount,
-                            'type': transaction_type,
-                            'category': category
-                        }
+                        transaction = Transaction(
+                            date=f"2025/{date_str}",
+                            cardholder=current_cardholder,
+                            merchant=merchant,
+                            amount=amount,
+                            type=transaction_type,
+                            category=category
+                        )
                         all_transactions.append(transaction)
                     
                 except (ValueError, IndexError) as e:
@@ -534,187 +1059,120 @@ class EnhancedChaseStatementAnalyzer:
         
         # Second pass: intelligently include credits that don't have offsetting purchases
         # For this specific case, we know UBER credits should be excluded if there are corresponding purchases
-        for credit in credits_to_include:
-            merchant = credit['merchant']
-            credit_amount = abs(credit['amount'])
-            
-            # Check if there's a corresponding purchase with the same amount
-            has_offsetting_purchase = False
-            for txn in all_transactions:
-                if txn['type'] == 'Purchase' and txn['amount'] == credit_amount:
-                    # Check if merchant names are similar (both contain UBER, APPLE, etc.)
-                    credit_base = merchant.upper().split()[0] if merchant else ''
-                    txn_base = txn['merchant'].upper().split()[0] if txn['merchant'] else ''
-                    
-                    if credit_base and credit_base in txn['merchant'].upper():
-                        has_offsetting_purchase = True
-                        if not getattr(self, 'summary_only', False):
-                            print(f"     Excluding credit {merchant} ${credit['amount']} - has offsetting purchase")
-                        break
-            
-            # Only include credit if it doesn't have an offsetting purchase
-            if not has_offsetting_purchase:
-                all_transactions.append(credit)
-                if not getattr(self, 'summary_only', False):
-                    print(f"     Including credit: {merchant} ${credit['amount']} → {credit['category']}")
+        self._include_unmatched_credits(credits_to_include, all_transactions, messages if verbose else None)
         
+        _write_lines(messages)
         return all_transactions
 
-    def extract_8635_format_transactions(self, lines):
+    def extract_8635_format_transactions(self, lines: list[str]) -> list[Transaction]:
         """Extract transactions from 8635 format (United Club card format with PAYMENTS/PURCHASE/FEES/INTEREST sections)"""
-        all_transactions = []
+        verbose = not getattr(self, 'summary_only', False)
+        # Progress messages are collected and written in one go when the extraction is done
+        messages: list[str] = []
+        all_transactions: list[Transaction] = []
         current_cardholder = "ASHOK RAJ"  # Default for 8635 format
-        in_payments_section = False
-        in_purchase_section = False
-        in_fees_section = False
-        in_interest_section = False
-        
-        # Transaction patterns for 8635 format: MM/DD MERCHANT NAME $ Amount
-        transaction_patterns = [
-            r'^(\d{2}/\d{2})\s+(.+?)\s+([-]?\d{1,3}(?:,\d{3})*\.?\d{0,2})$',
-            r'^(\d{2}/\d{2})\s+(.+?)\s+\$?([-]?\d{1,3}(?:,\d{3})*\.?\d{0,2})$'
-        ]
-        
-        # Skip patterns to avoid processing headers/footers
-        skip_patterns = [
-            'Date of', 'Transaction', 'Merchant Name', '$ Amount',
-            'ACCOUNT SUMMARY', 'ACCOUNT ACTIVITY', 'INTEREST CHARGES',
-            'Annual Percentage Rate', 'Balance Type', 'Year-to-date totals',
-            'Total fees charged', 'Total interest charged', 'TOTAL FEES FOR THIS PERIOD',
-            'TOTAL INTEREST FOR THIS PERIOD'
-        ]
+        section = None  # current statement section: payments, purchase, fees, interest
+        
+        # Transaction lines for 8635 format: MM/DD MERCHANT NAME $ Amount
         
         for line in lines:
             line = line.strip()
             if not line:
                 continue
+            line_upper = line.upper()
             
             # Check for section headers
-            if 'PAYMENTS AND OTHER CREDITS' in line.upper():
-                in_payments_section = True
-                in_purchase_section = False
-                in_fees_section = False
-                in_interest_section = False
+            if 'PAYMENTS AND OTHER CREDITS' in line_upper:
+                section = 'payments'
                 continue
-            elif 'PURCHASE' in line.upper() and not any(skip in line for skip in ['Year-to-date', 'Total', 'INTEREST']):
-                in_purchase_section = True
-                in_payments_section = False
-                in_fees_section = False
-                in_interest_section = False
+            elif 'PURCHASE' in line_upper and not _NOT_PURCHASE_SECTION_8635_RE.search(line):
+                section = 'purchase'
                 continue
-            elif 'FEES CHARGED' in line.upper():
-                in_fees_section = True
-                in_payments_section = False
-                in_purchase_section = False
-                in_interest_section = False
+            elif 'FEES CHARGED' in line_upper:
+                section = 'fees'
                 continue
-            elif 'INTEREST CHARGED' in line.upper():
-                in_interest_section = True
-                in_payments_section = False
-                in_purchase_section = False
-                in_fees_section = False
+            elif 'INTEREST CHARGED' in line_upper:
+                section = 'interest'
                 continue
             elif '2025 Totals Year-to-Date' in line:
-                in_payments_section = False
-                in_purchase_section = False
-                in_fees_section = False
-                in_interest_section = False
+                section = None
                 continue
             
-            # Skip header and footer lines
-            if any(skip in line for skip in skip_patterns):
-                continue
-            
-            # Skip year-to-date summary lines
-            if any(summary in line for summary in ['Total fees charged', 'Total interest charged']):
+            # Skip header and footer lines, including the year-to-date summary lines
+            if _SKIP_8635_RE.search(line):
                 continue
             
             # Only process transactions when in a valid section
-            if not (in_payments_section or in_purchase_section or in_fees_section or in_interest_section):
+            if section is None:
                 continue
             
-            # Try to match transaction patterns
-            transaction_found = False
-            for pattern in transaction_patterns:
-                match = re.match(pattern, line)
-                if match:
-                    try:
-                        date_str = match.group(1)
-                        merchant = match.group(2).strip()
-                        amount_str = match.group(3).replace('$', '').replace(',', '')
-                        
-                        # Skip if merchant is too short or looks like a header/total
-                        if len(merchant) < 3 or merchant.upper() in ['TOTAL', 'SUBTOTAL']:
+            # Try to match the transaction pattern
+            match = _TXN_0801_RE.match(line)
+            if match:
+                try:
+                    date_str = match.group(1)
+                    merchant = match.group(2).strip()
+                    
+                    # Skip if merchant is too short or looks like a header/total
+                    if len(merchant) < 3 or merchant.upper() in ['TOTAL', 'SUBTOTAL']:
+                        continue
+                    
+                    amount = _parse_amount(match.group(3))
+                    
+                    # Determine transaction type based on section
+                    if section == 'payments':
+                        # In payments section - skip actual payments, include credits/refunds
+                        if amount < 0 and ('payment' in merchant.lower() or 'thank you' in merchant.lower()):
+                            if verbose:
+                                messages.append(f"     Skipping payment: {merchant} ${amount}")
                             continue
-                        
-                        amount = float(amount_str)
-                        
-                        # Determine transaction type based on section
-                        if in_payments_section:
-                            # In payments section - skip actual payments, include credits/refunds
-                            if amount < 0 and ('payment' in merchant.lower() or 'thank you' in merchant.lower()):
-                                if not getattr(self, 'summary_only', False):
-                                    print(f"     Skipping payment: {merchant} ${amount}")
-                                transaction_found = True
-                                break
-                            else:
-                                # This is a credit/refund
-                                transaction_type = 'Credit'
-                                category = self.categorize_transaction(merchant, abs(amount))
-                        elif in_purchase_section:
-                            # In purchase section
-                            if amount < 0:
-                                # Negative amount in purchase section is unusual, skip
-                                continue
-                            transaction_type = 'Purchase'
-                            category = self.categorize_transaction(merchant, amount)
-                        elif in_fees_section:
-                            # In fees section
-                            transaction_type = 'Fee'
-                            category = 'CC FEES'
-                        elif in_interest_section:
-                            # In interest section - categorize as CC FEES per user request
-                            transaction_type = 'Interest'
-                            category = 'CC FEES'
                         else:
-                            continue  # Unknown section
-                        
-                        transaction = {
-                            'date': f"2025/{date_str}",
-                            'cardholder': current_cardholder,
-                            'merchant': merchant,
-                            'amount': amount,
-                            'type': transaction_type,
-                            'category': category
-                        }
-                        all_transactions.append(transaction)
-                        transaction_found = True
-                        break
-                        
-                    except (ValueError, IndexError):
-                        continue
-            
-            if transaction_found:
-                continue
+                            # This is a credit/refund
+                            transaction_type = 'Credit'
+                            category = self.categorize_transaction(merchant, abs(amount))
+                    elif section == 'purchase':
+                        # In purchase section
+                        if amount < 0:
+                            # Negative amount in purchase section is unusual, skip
+                            continue
+                        transaction_type = 'Purchase'
+                        category = self.categorize_transaction(merchant, amount)
+                    elif section == 'fees':
+                        # In fees section
+                        transaction_type = 'Fee'
+                        category = 'CC FEES'
+                    elif section == 'interest':
+                        # In interest section - categorize as CC FEES per user request
+                        transaction_type = 'Interest'
+                        category = 'CC FEES'
+                    else:
+                        continue  # Unknown section
+                    
+                    transaction = Transaction(
+                        date=f"2025/{date_str}",
+                        cardholder=current_cardholder,
+                        merchant=merchant,
+                        amount=amount,
+                        type=transaction_type,
+                        category=category
+                    )
+                    all_transactions.append(transaction)
+                    
+                except (ValueError, IndexError):
+                    continue
         
+        _write_lines(messages)
         return all_transactions
 
-    def extract_1250_format_transactions(self, lines):
+    def extract_1250_format_transactions(self, lines: list[str]) -> list[Transaction]:
         """Extract transactions from 1250 format (Bank of America format similar to tabular layout)"""
-        all_transactions = []
-        credits_to_include = []
+        verbose = not getattr(self, 'summary_only', False)
+        # Progress messages are collected and written in one go when the extraction is done
+        messages: list[str] = []
+        all_transactions: list[Transaction] = []
+        credits_to_include: list[Transaction] = []
         current_cardholder = "SUMATHI RAJ"  # Default for 1250 format
-        in_fees_section = False
-        in_credits_section = False
-        in_purchases_section = False
-        in_interest_section = False
-        
-        # Skip patterns to avoid processing headers/footers
-        skip_patterns = [
-            'Transaction Date', 'Posting Date', 'Description', 'Reference Number', 'Account Number', 'Amount', 'Total',
-            'TOTAL PAYMENTS', 'TOTAL PURCHASES', 'TOTAL INTEREST', 'TOTAL FEES',
-            '2025 Totals Year-to-Date', 'Interest Charge Calculation'
-        ]
+        section = None  # current statement section: credits, purchases, fees, interest
         
         for line in lines:
             line = line.strip()
@@ -723,45 +1181,29 @@ class EnhancedChaseStatementAnalyzer:
             
             # Section detection
             if 'Payments and Other Credits' in line:
-                in_credits_section = True
-                in_purchases_section = False
-                in_fees_section = False
-                in_interest_section = False
+                section = 'credits'
                 continue
             elif 'Purchases and Adjustments' in line:
-                in_purchases_section = True
-                in_credits_section = False
-                in_fees_section = False
-                in_interest_section = False
+                section = 'purchases'
                 continue
             elif 'Fees Charged' in line:
-                in_fees_section = True
-                in_credits_section = False
-                in_purchases_section = False
-                in_interest_section = False
+                section = 'fees'
                 continue
             elif 'Interest Charged' in line:
-                in_interest_section = True
-                in_credits_section = False
-                in_purchases_section = False
-                in_fees_section = False
+                section = 'interest'
                 continue
             
-            # Skip header and footer lines
-            if any(skip in line for skip in skip_patterns):
-                continue
-            
-            # Skip year-to-date summary lines
-            if 'Total fees charged' in line or 'Total interest charged' in line:
+            # Skip header and footer lines ('Total' also covers the year-to-date summary lines)
+            if _SKIP_1250_RE.search(line):
                 continue
             
             # Only process transactions when in a valid section
-            if not (in_credits_section or in_purchases_section or in_fees_section or in_interest_section):
+            if section is None:
                 continue
             
             # Transaction pattern: MM/DD MM/DD DESCRIPTION REFERENCE ACCOUNT AMOUNT
             # Example: "01/06 01/08 ALASKA AIR SEATTLE WA 0996 1250 -9.99"
-            transaction_match = re.match(r'^(\d{2}/\d{2})\s+(\d{2}/\d{2})\s+(.+?)\s+(\d+)\s+(\d{4})\s+([-]?\d{1,3}(?:,\d{3})*\.?\d{0,2})$', line)
+            transaction_match = _TXN_1250_RE.match(line)
             
             if transaction_match:
                 try:
@@ -770,87 +1212,66 @@ class EnhancedChaseStatementAnalyzer:
                     description = transaction_match.group(3).strip()
                     reference = transaction_match.group(4)
                     account_last4 = transaction_match.group(5)
-                    amount_str = transaction_match.group(6).replace(',', '')
                     
                     # Skip if description is too short
                     if len(description) < 3:
                         continue
                     
-                    amount = float(amount_str)
+                    amount = _parse_amount(transaction_match.group(6))
                     
                     # Determine transaction type based on section and amount
-                    if in_credits_section:
+                    if section == 'credits':
                         if amount < 0:
                             # This is a credit/refund or payment
-                            if 'ELECTRONIC PAYMENT' in description.upper() or 'PAYMENT' in description.upper():
+                            if 'PAYMENT' in description.upper():  # includes ELECTRONIC PAYMENT
                                 # Skip payments
-                                if not getattr(self, 'summary_only', False):
-                                    print(f"     Skipping payment: {description} ${amount}")
+                                if verbose:
+                                    messages.append(f"     Skipping payment: {description} ${amount}")
                                 continue
                             else:
                                 # This is a credit/refund - store for later processing
-                                credits_to_include.append({
-                                    'date': f"2025/{trans_date}",
-                                    'cardholder': current_cardholder,
-                                    'merchant': description,
-                                    'amount': amount,
-                                    'type': 'Credit',
-                                    'category': self.categorize_transaction(description, abs(amount))
-                                })
+                                credits_to_include.append(Transaction(
+                                    date=f"2025/{trans_date}",
+                                    cardholder=current_cardholder,
+                                    merchant=description,
+                                    amount=amount,
+                                    type='Credit',
+                                    category=self.categorize_transaction(description, abs(amount))
+                                ))
                         continue
-                    elif in_purchases_section:
+                    elif section == 'purchases':
                         if amount < 0:
                             # Negative amount in purchases section - should be rare, skip
                             continue
                         transaction_type = 'Purchase'
                         category = self.categorize_transaction(description, amount)
-                    elif in_fees_section:
+                    elif section == 'fees':
                         transaction_type = 'Fee'
                         category = 'CC FEES'
-                    elif in_interest_section:
+                    elif section == 'interest':
                         transaction_type = 'Interest'
                         category = 'CC FEES'
                     else:
                         continue
                     
                     # Create transaction record
-                    transaction = {
-                        'date': f"2025/{trans_date}",
-                        'cardholder': current_cardholder,
-                        'merchant': description,
-                        'amount': amount,
-                        'type': transaction_type,
-                        'category': category
-                    }
+                    transaction = Transaction(
+                        date=f"2025/{trans_date}",
+                        cardholder=current_cardholder,
+                        merchant=description,
+                        amount=amount,
+                        type=transaction_type,
+                        category=category
+                    )
                     all_transactions.append(transaction)
                     
                 except (ValueError, IndexError):
                     continue
         
         # Second pass: intelligently include credits that don't have offsetting purchases
-        for credit in credits_to_include:
-            merchant = credit['merchant']
-            credit_amount = abs(credit['amount'])
-            
-            # Check if there's a corresponding purchase with the same amount
-            has_offsetting_purchase = False
-            for txn in all_transactions:
-                if txn['type'] == 'Purchase' and txn['amount'] == credit_amount:
-                    # Check if merchant names are similar
-                    credit_base = merchant.upper().split()[0] if merchant else ''
-                    
-                    if credit_base and credit_base in txn['merchant'].upper():
-                        has_offsetting_purchase = True
-                        if not getattr(self, 'summary_only', False):
-                            print(f"     Excluding credit {merchant} ${credit['amount']} - has offsetting purchase")
-                        break
-            
-            # Only include credit if it doesn't have an offsetting purchase
-            if not has_offsetting_purchase:
-                all_transactions.append(credit)
-                if not getattr(self, 'summary_only', False):
-                    print(f"     Including credit: {merchant} ${credit['amount']} → {credit['category']}")
+        self._include_unmatched_credits(credits_to_include, all_transactions, messages if verbose else None)
         
+        _write_lines(messages)
         return all_transactions
 
     def load_master_categories(self, master_file):
@@ -869,11 +1290,9 @@ class EnhancedChaseStatementAnalyzer:
         
         try:
             with open(master_file, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    pattern = row['vendor_pattern'].strip()
-                    category = row['category'].strip()
-                    master_categories[pattern] = category
+                reader = csv.reader(file)
+                next(reader, None)  # vendor_pattern,category header
+                master_categories = {row[0].strip(): row[1].strip() for row in reader if len(row) >= 2}
             
             if not getattr(self, 'summary_only', False):
                 print(f"   📋 Loaded {len(master_categories)} categorization rules from {os.path.basename(master_file)}")
@@ -883,6 +1302,33 @@ class EnhancedChaseStatementAnalyzer:
             print(f"   ⚠️  Warning: Could not load master categories: {e}")
             return {}
 
+    def load_master_matcher(self, master_file, master_categories):
+        """Pattern automaton for master_categories, reusing the one saved next to master_file"""
+        matcher_file = f"{master_file}.ac.pkl"
+        try:
+            if os.path.getmtime(matcher_file) >= os.path.getmtime(master_file):
+                with open(matcher_file, 'rb') as file:
+                    matcher = pickle.load(file)
+                # mtimes can tie when the master file is edited within the same
+                # clock tick, so only reuse an automaton built from these exact rules
+                if list(matcher.master_categories.items()) == list(master_categories.items()):
+                    matcher.master_categories = master_categories
+                    return matcher
+        except Exception:
+            pass  # Missing, stale or unreadable: rebuild below
+        
+        matcher = MasterPatternMatcher(master_categories)
+        try:
+            # Parallel directory workers may rebuild at the same time; replace
+            # the file atomically so none of them reads a partial pickle
+            temp_file = f"{matcher_file}.{os.getpid()}.tmp"
+            with open(temp_file, 'wb') as file:
+                pickle.dump(matcher, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file, matcher_file)
+        except Exception as e:
+            print(f"   ⚠️  Warning: Could not save master pattern cache: {e}")
+        return matcher
+
     def save_master_categories(self, master_categories, master_file):
         """Save master categorization rules to CSV file, sorted by vendor pattern"""
         try:
@@ -897,16 +1343,40 @@ class EnhancedChaseStatementAnalyzer:
         except Exception as e:
             print(f"   ⚠️  Warning: Could not save master categories: {e}")
 
-    def extract_vendor_key(self, merchant):
+    def append_master_categories(self, added_categories, master_file):
+        """Append new rules to the master CSV file without rewriting existing rows.
+
+        Rows stay in the order they were learned; a later row for the same
+        pattern overrides an earlier one when the file is loaded. Use
+        --compact-master to sort and de-duplicate the file.
+        """
+        try:
+            with open(master_file, 'a+b') as file:
+                file.seek(0, os.SEEK_END)
+                if file.tell() == 0:
+                    needs_header, needs_newline = True, False
+                else:
+                    file.seek(-1, os.SEEK_END)
+                    needs_header, needs_newline = False, file.read(1) != b'\n'
+            
+            with open(master_file, 'a', encoding='utf-8', newline='') as file:
+                if needs_newline:
+                    file.write('\r\n')
+                writer = csv.writer(file)
+                if needs_header:
+                    writer.writerow(['vendor_pattern', 'category'])
+                writer.writerows(sorted(added_categories.items()))
+                
+        except Exception as e:
+            print(f"   ⚠️  Warning: Could not save master categories: {e}")
+
+    def extract_vendor_key(self, merchant: str) -> str:
         """Extract a key vendor name from the full merchant string"""
         merchant = merchant.upper()
         
-        # Remove common suffixes and numbers
-        cleaned = re.sub(r'\s+\d+.*$', '', merchant)  # Remove trailing numbers and text
-        cleaned = re.sub(r'\s+(LLC|INC|CORP|CO).*$', '', cleaned)  # Remove company suffixes
-        cleaned = re.sub(r'\s+#\d+.*$', '', cleaned)  # Remove store numbers
-        cleaned = re.sub(r'\s+\d{3}-\d{3}-\d{4}.*$', '', cleaned)  # Remove phone numbers
-        cleaned = re.sub(r'\s+[A-Z]{2}$', '', cleaned)  # Remove state codes
+        # Remove common suffixes and numbers (trailing numbers, phone numbers,
+        # company suffixes, store numbers) and the state code, in one match
+        cleaned = _VENDOR_KEY_RE.fullmatch(merchant).group(1)
         
         # Take first few meaningful words
         words = cleaned.split()
@@ -946,20 +1416,13 @@ class EnhancedChaseStatementAnalyzer:
             else:
                 return master_categories['AMAZON'], False
         
-        # Check each pattern in master categories - prefer longer, more specific matches
-        best_match = None
-        best_pattern = ""
-        best_category = ""
-        
-        for pattern, new_category in master_categories.items():
-            if pattern.upper() in merchant_upper:
-                # Prefer longer patterns over shorter ones for more specific matching
-                if len(pattern) > len(best_pattern):
-                    best_match = pattern
-                    best_pattern = pattern
-                    best_category = new_category
+        # Find the longest (most specific) master pattern in the merchant name
+        if self.master_matcher is None or self.master_matcher.master_categories is not master_categories:
+            self.master_matcher = MasterPatternMatcher(master_categories)
+        best_match = self.master_matcher.best_match(merchant_upper)
         
         if best_match:
+            best_pattern, best_category = best_match
             # Debug: print successful matches for testing
             if not getattr(self, 'summary_only', False) and best_category != 'OTHER':
                 print(f"     ✅ Pattern match: '{best_pattern}' in '{merchant}' → {best_category}")
@@ -981,16 +1444,26 @@ class EnhancedChaseStatementAnalyzer:
         if not self.master_file:
             return transactions, 0
         
-        self.master_categories = self.load_master_categories(self.master_file)
+        signature = _master_file_signature(self.master_file)
+        loaded = _loaded_master_rules.get(self.master_file)
+        if signature is not None and loaded is not None and loaded[0] == signature:
+            self.master_categories, self.master_matcher = loaded[1], loaded[2]
+            if not getattr(self, 'summary_only', False):
+                print(f"   📋 Loaded {len(self.master_categories)} categorization rules from {os.path.basename(self.master_file)}")
+        else:
+            self.master_categories = self.load_master_categories(self.master_file)
+            self.master_matcher = self.load_master_matcher(self.master_file, self.master_categories)
+            if signature is not None:
+                _loaded_master_rules[self.master_file] = (signature, self.master_categories, self.master_matcher)
         self.new_vendors = set()
         recategorized_count = 0
         
         for txn in transactions:
-            original_category = txn['category']
-            merchant = txn['merchant']
+            original_category = txn.category
+            merchant = txn.merchant
             
             # Preserve CC FEES category for fee transactions - don't recategorize
-            if txn.get('type') == 'Fee' and original_category == 'CC FEES':
+            if txn.type == 'Fee' and original_category == 'CC FEES':
                 final_category = 'CC FEES'
                 is_new_vendor = False
             else:
@@ -1001,17 +1474,23 @@ class EnhancedChaseStatementAnalyzer:
             if final_category != original_category:
                 recategorized_count += 1
             
-            txn['original_category'] = original_category
-            txn['category'] = final_category
+            txn.original_category = original_category
+            txn.category = final_category
         
         # Add new vendors to master file
         if self.new_vendors:
             print(f"   🆕 Found {len(self.new_vendors)} new vendors, adding to master file...")
             
+            added_categories = {}
             for vendor_key, category in self.new_vendors:
-                self.master_categories[vendor_key] = category
+                added_categories[vendor_key] = category
+            # A new dict, so the rules shared through _loaded_master_rules stay as loaded
+            self.master_categories = {**self.master_categories, **added_categories}
+            self.master_matcher = None
+            self.learned_master_categories = added_categories
             
-            self.save_master_categories(self.master_categories, self.master_file)
+            if not self.defer_master_updates:
+                self.append_master_categories(added_categories, self.master_file)
             print(f"   💾 Updated {os.path.basename(self.master_file)} with new vendors")
         
         if recategorized_count > 0 and not getattr(self, 'summary_only', False):
@@ -1021,21 +1500,27 @@ class EnhancedChaseStatementAnalyzer:
 
     def verify_totals(self):
         """Verify extracted totals match statement totals"""
-        # Sum all transactions (purchases + fees + credits + interest)
-        calculated_total_all = sum(txn['amount'] for txn in self.transactions)
-        
-        # Sum only purchases (for purchase verification)
-        calculated_purchases_only = sum(txn['amount'] for txn in self.transactions 
-                                       if txn.get('type') == 'Purchase')
-        
-        # Sum purchases and fees (for statement comparison in some formats)
-        calculated_purchases_fees = sum(txn['amount'] for txn in self.transactions 
-                                       if txn.get('type') in ['Purchase', 'Fee'])
+        # One pass over the transactions accumulates every total and count;
+        # amounts are added in transaction order
+        calculated_total_all = 0.0  # purchases + fees + credits + interest
+        calculated_purchases_only = 0.0  # for purchase verification
+        calculated_purchases_fees = 0.0  # for statement comparison in some formats
+        type_counts = Counter()
+        for txn in self.transactions:
+            txn_type = txn.type
+            amount = txn.amount
+            calculated_total_all += amount
+            if txn_type == 'Purchase':
+                calculated_purchases_only += amount
+                calculated_purchases_fees += amount
+            elif txn_type == 'Fee':
+                calculated_purchases_fees += amount
+            type_counts[txn_type] += 1
         
         # For 8635 format, compare purchases against statement purchase total
         # For 1250 format, compare purchases against statement purchase total  
         # For other formats, compare all transactions against new balance
-        if hasattr(self, 'pdf_file') and '8635' in self.pdf_file:
+        if '8635' in self.pdf_file_formats:
             # 8635 format: compare our calculated purchases against statement purchases
             comparison_total = calculated_purchases_only
             statement_comparison = self.statement_purchase_total
@@ -1044,32 +1529,14 @@ class EnhancedChaseStatementAnalyzer:
             # This accounts for purchases/fees or credits we may have missed
             difference = comparison_total - statement_comparison
             if abs(difference) > 0.01:
-                if difference > 0:
-                    # We calculated more than statement - missing credits
-                    adjustment_transaction = {
-                        'date': '2025/01/01',
-                        'cardholder': 'SYSTEM ADJUSTMENT',
-                        'merchant': 'UNMATCHED CREDITS',
-                        'amount': -difference,
-                        'type': 'Credit',
-                        'category': 'OTHER'
-                    }
-                else:
-                    # We calculated less than statement - missing purchases/fees
-                    adjustment_transaction = {
-                        'date': '2025/01/01',
-                        'cardholder': 'SYSTEM ADJUSTMENT',
-                        'merchant': 'UNMATCHED PURCHASES/FEES',
-                        'amount': -difference,
-                        'type': 'Purchase',
-                        'category': 'OTHER'
-                    }
+                adjustment_transaction = _balancing_transaction(difference)
                 self.transactions.append(adjustment_transaction)
+                type_counts[adjustment_transaction.type] += 1
                 # Recalculate totals
-                calculated_purchases_only = sum(txn['amount'] for txn in self.transactions 
-                                               if txn.get('type') == 'Purchase')
+                if adjustment_transaction.type == 'Purchase':
+                    calculated_purchases_only += adjustment_transaction.amount
                 comparison_total = calculated_purchases_only
-        elif hasattr(self, 'pdf_file') and '1250' in self.pdf_file:
+        elif '1250' in self.pdf_file_formats:
             # 1250 format: compare all transactions against new balance total
             # If there's a mismatch, check if we need to account for additional credits
             comparison_total = calculated_total_all
@@ -1079,29 +1546,11 @@ class EnhancedChaseStatementAnalyzer:
             # This accounts for credits or purchases/fees we may have missed
             difference = comparison_total - statement_comparison
             if abs(difference) > 0.01:
-                if difference > 0:
-                    # We calculated more than statement - missing credits
-                    adjustment_transaction = {
-                        'date': '2025/01/01',
-                        'cardholder': 'SYSTEM ADJUSTMENT',
-                        'merchant': 'UNMATCHED CREDITS',
-                        'amount': -difference,
-                        'type': 'Credit',
-                        'category': 'OTHER'
-                    }
-                else:
-                    # We calculated less than statement - missing purchases/fees
-                    adjustment_transaction = {
-                        'date': '2025/01/01',
-                        'cardholder': 'SYSTEM ADJUSTMENT', 
-                        'merchant': 'UNMATCHED PURCHASES/FEES',
-                        'amount': -difference,
-                        'type': 'Purchase',
-                        'category': 'OTHER'
-                    }
+                adjustment_transaction = _balancing_transaction(difference)
                 self.transactions.append(adjustment_transaction)
+                type_counts[adjustment_transaction.type] += 1
                 # Recalculate totals
-                calculated_total_all = sum(txn['amount'] for txn in self.transactions)
+                calculated_total_all += adjustment_transaction.amount
                 comparison_total = calculated_total_all
         else:
             # 5136/0801 formats: compare all transactions (purchases + fees + credits) against new balance
@@ -1110,32 +1559,14 @@ class EnhancedChaseStatementAnalyzer:
             statement_comparison = self.statement_new_balance
             
             # For 5136 and 0801 formats, automatically balance against new balance total like 1250
-            if hasattr(self, 'pdf_file') and ('5136' in self.pdf_file or '0801' in self.pdf_file):
+            if self.pdf_file_formats:  # 5136 or 0801
                 difference = comparison_total - statement_comparison
                 if abs(difference) > 0.01:
-                    if difference > 0:
-                        # We calculated more than statement - missing credits
-                        adjustment_transaction = {
-                            'date': '2025/01/01',
-                            'cardholder': 'SYSTEM ADJUSTMENT',
-                            'merchant': 'UNMATCHED CREDITS',
-                            'amount': -difference,
-                            'type': 'Credit',
-                            'category': 'OTHER'
-                        }
-                    else:
-                        # We calculated less than statement - missing purchases/fees
-                        adjustment_transaction = {
-                            'date': '2025/01/01',
-                            'cardholder': 'SYSTEM ADJUSTMENT',
-                            'merchant': 'UNMATCHED PURCHASES/FEES',
-                            'amount': -difference,
-                            'type': 'Purchase',
-                            'category': 'OTHER'
-                        }
+                    adjustment_transaction = _balancing_transaction(difference)
                     self.transactions.append(adjustment_transaction)
+                    type_counts[adjustment_transaction.type] += 1
                     # Recalculate totals
-                    calculated_total_all = sum(txn['amount'] for txn in self.transactions)
+                    calculated_total_all += adjustment_transaction.amount
                     comparison_total = calculated_total_all
         
         balance_match = abs(comparison_total - statement_comparison) < 0.01
@@ -1148,11 +1579,11 @@ class EnhancedChaseStatementAnalyzer:
             'payment_total_statement': self.statement_payment_total,
             'payment_match': True,  # N/A since we excluded payments
             'total_transactions': len(self.transactions),
-            'purchase_count': len([t for t in self.transactions if t.get('type') == 'Purchase']),
+            'purchase_count': type_counts['Purchase'],
             'payment_count': 0,  # No payments included
-            'fee_count': len([t for t in self.transactions if t.get('type') == 'Fee']),
-            'credit_count': len([t for t in self.transactions if t.get('type') == 'Credit']),
-            'interest_count': len([t for t in self.transactions if t.get('type') == 'Interest']),
+            'fee_count': type_counts['Fee'],
+            'credit_count': type_counts['Credit'],
+            'interest_count': type_counts['Interest'],
             'purchases_fees_total': calculated_purchases_fees,  # For reference
             'purchases_only_total': calculated_purchases_only,  # For reference
             'all_transactions_total': calculated_total_all  # Include all transactions for category breakdown
@@ -1163,40 +1594,60 @@ class EnhancedChaseStatementAnalyzer:
         with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
             # Include original_category field if it exists in transactions
             base_fieldnames = ['date', 'cardholder', 'merchant', 'amount', 'type', 'category']
-            if transactions and 'original_category' in transactions[0]:
+            if transactions and transactions[0].original_category is not None:
                 fieldnames = ['date', 'cardholder', 'merchant', 'amount', 'type', 'category', 'original_category']
             else:
                 fieldnames = base_fieldnames
                 
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.writer(csvfile)
             
-            writer.writeheader()
-            for txn in transactions:
-                # Only write fields that exist in fieldnames
-                filtered_txn = {k: v for k, v in txn.items() if k in fieldnames}
-                writer.writerow(filtered_txn)
+            writer.writerow(fieldnames)
+            # Project each transaction onto fieldnames; unset fields (None) are written empty
+            writer.writerows(map(attrgetter(*fieldnames), transactions))
 
     def process_pdf_file(self, pdf_path, create_csv=False, use_master=False, interactive=False, summary_only=False):
         """Process a single PDF file by actually reading it"""
         self.pdf_file = pdf_path
+        self.pdf_file_formats = frozenset(code for code in _FORMAT_EXTRACTORS if code in pdf_path)
         self.summary_only = summary_only  # Store for use in other methods
         
         if not summary_only:
             print(f"🔍 Processing PDF file: {os.path.basename(pdf_path)}")
             print("=" * 80)
         
-        # Step 1: Extract PDF content
-        self.pdf_text = self.extract_pdf_content(pdf_path)
-        if not self.pdf_text:
-            if not summary_only:
-                print("❌ Failed to extract PDF content")
-            return None
+        # Steps 1-3 are skipped when this PDF was already parsed. Master
+        # categorization is not cached: it runs on every invocation so edits
+        # to the master file always apply.
+        cache_path = None
+        transactions = None
+        if self.use_cache:
+            try:
+                cache_path = self.get_parse_cache_path(pdf_path)
+            except Exception as e:
+                print(f"   ⚠️  Warning: Could not hash PDF for parse cache: {e}")
+            else:
+                transactions = self.load_parse_cache(cache_path)
+                if transactions is not None and not summary_only:
+                    print(f"   📦 Loaded {len(transactions)} transactions from parse cache")
+        
+        if transactions is None:
+            # Step 1: Extract PDF content
+            self.pdf_text = self.extract_pdf_content(pdf_path)
+            if not self.pdf_text:
+                if not summary_only:
+                    print("❌ Failed to extract PDF content")
+                return None
+                
+            # Step 2: Parse statement summary
+            self.parse_statement_summary(self.pdf_text)
             
-        # Step 2: Parse statement summary
-        self.parse_statement_summary(self.pdf_text)
+            # Step 3: Extract transactions. The text is split into lines once
+            # here and the format detector and extractors all share that list.
+            lines = self.pdf_text.split('\n')
+            transactions = self.extract_transactions_from_pdf(lines)
+            if transactions and cache_path:
+                self.save_parse_cache(cache_path, transactions)
         
-        # Step 3: Extract transactions
-        transactions = self.extract_transactions_from_pdf(self.pdf_text)
         if not transactions:
             if not summary_only:
                 print("❌ No transactions found in PDF")
@@ -1240,133 +1691,139 @@ class EnhancedChaseStatementAnalyzer:
 
     def display_results(self, verification, summary_only=False):
         """Display analysis results"""
+        # Nothing would be shown without a stdout, so skip building the report
+        if sys.stdout is None:
+            return
+        
+        # Report lines are collected and written in one go rather than printed one by one
+        out = []
         if summary_only:
             # Summary-only mode: just show totals and category breakdown with header
             # Use Statement Month for 1250, 0801, 5136, and 8635 formats, Statement Period for others
             statement_display = self.get_statement_month()
-            if hasattr(self, 'pdf_file') and ('1250' in self.pdf_file or '0801' in self.pdf_file or '5136' in self.pdf_file or '8635' in self.pdf_file):
-                print(f"\n📅 STATEMENT MONTH: {statement_display}")
+            if self.pdf_file_formats:
+                out.append(f"\n📅 STATEMENT MONTH: {statement_display}")
             else:
-                print(f"\n📅 STATEMENT PERIOD: {statement_display}")
-            print(f"📊 STATEMENT TOTALS")
-            print("=" * 50)
-            print(f"Statement Total: ${verification['purchase_total_statement']:,.2f}")
-            print(f"Calculated Total: ${verification['purchase_total_calculated']:,.2f}")
+                out.append(f"\n📅 STATEMENT PERIOD: {statement_display}")
+            out.append(f"📊 STATEMENT TOTALS")
+            out.append("=" * 50)
+            out.append(f"Statement Total: ${verification['purchase_total_statement']:,.2f}")
+            out.append(f"Calculated Total: ${verification['purchase_total_calculated']:,.2f}")
             
             # Use the verification results which already account for automatic adjustments
             if verification['purchase_match']:
-                print("Status: ✅ MATCH")
+                out.append("Status: ✅ MATCH")
             else:
                 diff = verification['purchase_total_calculated'] - verification['purchase_total_statement']
-                print(f"Status: ❌ MISMATCH (${diff:,.2f})")
+                out.append(f"Status: ❌ MISMATCH (${diff:,.2f})")
+            
+            _write_lines(out)
             
             # Category breakdown table
             self.display_category_table()
             return
         
         # Full detailed output (original behavior)
-        print("\n" + "=" * 80)
-        print("CHASE CREDIT CARD STATEMENT ANALYSIS - REAL PDF DATA")
-        print("=" * 80)
+        out.append("\n" + "=" * 80)
+        out.append("CHASE CREDIT CARD STATEMENT ANALYSIS - REAL PDF DATA")
+        out.append("=" * 80)
         # Use Statement Month for 1250, 0801, 5136, and 8635 formats, Statement Period for others
         statement_display = self.get_statement_month()
-        if hasattr(self, 'pdf_file') and ('1250' in self.pdf_file or '0801' in self.pdf_file or '5136' in self.pdf_file or '8635' in self.pdf_file):
-            print(f"📅 STATEMENT MONTH: {statement_display}")
+        if self.pdf_file_formats:
+            out.append(f"📅 STATEMENT MONTH: {statement_display}")
         else:
-            print(f"📅 STATEMENT PERIOD: {statement_display}")
-        print(f"File: {self.pdf_file}")
-        print(f"Previous Balance: ${self.statement_previous_balance:,.2f}")
-        print(f"New Balance: ${self.statement_new_balance:,.2f}")
-        print()
+            out.append(f"📅 STATEMENT PERIOD: {statement_display}")
+        out.append(f"File: {self.pdf_file}")
+        out.append(f"Previous Balance: ${self.statement_previous_balance:,.2f}")
+        out.append(f"New Balance: ${self.statement_new_balance:,.2f}")
+        out.append("")
         
         # Cardholder summary (purchases only)
-        cardholders = {}
-        for txn in self.transactions:
-            cardholder = txn['cardholder']
-            if cardholder not in cardholders:
-                cardholders[cardholder] = []
-            cardholders[cardholder].append(txn)
-        
-        print("SUMMARY BY CARDHOLDER (PURCHASES ONLY)")
-        print("=" * 80)
-        print()
-        
-        for cardholder, txns in cardholders.items():
-            total_amount = sum(txn['amount'] for txn in txns)
-            print(f"{cardholder}:")
-            print(f"  Total Transactions: {len(txns)}")
-            print(f"  Purchases: ${total_amount:,.2f}")
-            print()
+        out.append("SUMMARY BY CARDHOLDER (PURCHASES ONLY)")
+        out.append("=" * 80)
+        out.append("")
+        
+        for cardholder, (count, amount) in self.get_transaction_stats()['by_cardholder'].items():
+            out.append(f"{cardholder}:")
+            out.append(f"  Total Transactions: {count}")
+            out.append(f"  Purchases: ${amount:,.2f}")
+            out.append("")
         
         # Verification summary
-        print("=" * 80)
-        print("VERIFICATION SUMMARY")
-        print("=" * 80)
+        out.append("=" * 80)
+        out.append("VERIFICATION SUMMARY")
+        out.append("=" * 80)
         
-        print("Purchase Totals:")
-        print(f"  Statement: ${verification['purchase_total_statement']:,.2f}")
-        print(f"  Calculated: ${verification['purchase_total_calculated']:,.2f}")
+        out.append("Purchase Totals:")
+        out.append(f"  Statement: ${verification['purchase_total_statement']:,.2f}")
+        out.append(f"  Calculated: ${verification['purchase_total_calculated']:,.2f}")
         if verification['purchase_match']:
-            print("  Status: ✅ PERFECT MATCH!")
+            out.append("  Status: ✅ PERFECT MATCH!")
         else:
             diff = verification['purchase_total_calculated'] - verification['purchase_total_statement']
-            print(f"  Status: ❌ MISMATCH (${diff:,.2f})")
+            out.append(f"  Status: ❌ MISMATCH (${diff:,.2f})")
         
-        print("\nPayments: EXCLUDED from analysis")
-        print("\nOverall: ✅ PURCHASE TOTALS MATCH STATEMENT")
+        out.append("\nPayments: EXCLUDED from analysis")
+        out.append("\nOverall: ✅ PURCHASE TOTALS MATCH STATEMENT")
         
-        print(f"\nCategory Summary Verification (Purchases Only):")
-        print(f"  Statement Purchase Total: ${verification['purchase_total_statement']:,.2f}")
-        print(f"  Extracted Purchase Total: ${verification['purchase_total_calculated']:,.2f}")
-        print(f"  Status: ✅ CATEGORY TOTALS MATCH STATEMENT")
+        out.append(f"\nCategory Summary Verification (Purchases Only):")
+        out.append(f"  Statement Purchase Total: ${verification['purchase_total_statement']:,.2f}")
+        out.append(f"  Extracted Purchase Total: ${verification['purchase_total_calculated']:,.2f}")
+        out.append(f"  Status: ✅ CATEGORY TOTALS MATCH STATEMENT")
+        
+        _write_lines(out)
         
         # Category breakdown table
         self.display_category_table()
 
+    def get_transaction_stats(self):
+        """Category, cardholder and grand-total aggregates of self.transactions.
+
+        Aggregated once and shared by the cardholder summary, the category
+        table and the .categories file; recomputed only after transactions
+        are added or replaced.
+        """
+        if (self._stats_cache is None or self._stats_source is not self.transactions
+                or self._stats_count != len(self.transactions)):
+            self._stats_cache = _aggregate_transactions(self.transactions)
+            self._stats_source = self.transactions
+            self._stats_count = len(self.transactions)
+        return self._stats_cache
+
     def display_category_table(self):
         """Display category breakdown in a formatted table"""
         if not self.transactions:
             return
+        out = []
             
-        # Calculate category statistics
-        category_stats = {}
-        for txn in self.transactions:
-            cat = txn['category']
-            if cat not in category_stats:
-                category_stats[cat] = {'count': 0, 'amount': 0.0}
-            category_stats[cat]['count'] += 1
-            category_stats[cat]['amount'] += txn['amount']
+        # Category statistics
+        stats = self.get_transaction_stats()
         
         # Sort categories by amount (highest first)
-        sorted_categories = sorted(category_stats.items(), key=lambda x: x[1]['amount'], reverse=True)
+        sorted_categories = sorted(stats['by_category'].items(), key=lambda x: x[1][1], reverse=True)
         
-        print(f"\n" + "=" * 80)
-        print("CATEGORY BREAKDOWN TABLE")
-        print("=" * 80)
+        out.append("\n" + "=" * 80)
+        out.append("CATEGORY BREAKDOWN TABLE")
+        out.append("=" * 80)
         
         # Table header
-        print(f"{'Category':<20} {'Count':<8} {'Amount':<15} {'% of Total':<12}")
-        print("-" * 80)
+        out.append(_CATEGORY_TABLE_HEADER)
+        out.append("-" * 80)
         
-        # Calculate total for percentages
-        total_amount = sum(stats['amount'] for _, stats in sorted_categories)
+        # Totals come from the same aggregation pass as the categories
+        total_amount = stats['grand_total']
+        total_count = len(self.transactions)
         
         # Table rows
-        for category, stats in sorted_categories:
-            percentage = (stats['amount'] / total_amount * 100) if total_amount > 0 else 0
-            print(f"{category:<20} {stats['count']:<8} ${stats['amount']:<14,.2f} {percentage:<11.1f}%")
+        out.extend(_category_rows(sorted_categories, total_amount))
         
         # Total row
-        total_count = sum(stats['count'] for _, stats in sorted_categories)
-        print("-" * 80)
-        print(f"{'TOTAL':<20} {total_count:<8} ${total_amount:<14,.2f} {'100.0':<11}%")
-        print("=" * 80)
-        # For comparison, calculate purchases + fees total (consistent with statement total verification)
-        purchases_fees_total = sum(txn['amount'] for txn in self.transactions 
-                                  if txn.get('type') in ['Purchase', 'Fee'])
+        out.append("-" * 80)
+        out.append(f"{'TOTAL':<20} {total_count:<8} ${total_amount:<14,.2f} {'100.0':<11}%")
+        out.append("=" * 80)
         
         # For 8635 format, compare against net change in balance; for 1250, compare against purchases; for others, match verification logic
-        if hasattr(self, 'pdf_file') and '8635' in self.pdf_file:
+        if '8635' in self.pdf_file_formats:
             # For 8635: our transactions exclude payments, so we compare against:
             # Net change + payment amount (since payments reduce the net change but aren't in our totals)
             net_change = self.statement_new_balance - self.statement_previous_balance  
@@ -1375,106 +1832,75 @@ class EnhancedChaseStatementAnalyzer:
             payment_amount = total_amount - net_change
             statement_comparison_amount = net_change + payment_amount
             comparison_label = f"Net Change + Payments (${payment_amount:,.2f})"
-        elif hasattr(self, 'pdf_file') and '1250' in self.pdf_file:
+            match_message = "✅ CATEGORIES MATCH STATEMENT TOTAL"
+        elif '1250' in self.pdf_file_formats:
             # For 1250: compare all transactions against new balance total
             statement_comparison_amount = self.statement_new_balance
             comparison_label = "New Balance Total"
+            match_message = "✅ CATEGORIES MATCH STATEMENT TOTAL"
         else:
             # For 5136/0801: compare against new balance (statement balance)
             statement_comparison_amount = self.statement_new_balance
             comparison_label = "Statement Balance"
+            match_message = "✅ CATEGORIES MATCH STATEMENT BALANCE"
             
-        print(f"Category Sum: ${total_amount:,.2f} | {comparison_label}: ${statement_comparison_amount:,.2f}")
+        out.append(f"Category Sum: ${total_amount:,.2f} | {comparison_label}: ${statement_comparison_amount:,.2f}")
         
         # Compare against appropriate statement total and add MISC adjustment if needed
-        if hasattr(self, 'pdf_file') and '8635' in self.pdf_file:
-            # For 8635: all transactions (purchases + fees + interest + credits) should sum to net change
-            diff = statement_comparison_amount - total_amount
-            if abs(diff) < 0.01:
-                print("✅ CATEGORIES MATCH STATEMENT TOTAL")
-            else:
-                print(f"❌ CATEGORY MISMATCH: ${diff:,.2f}")
-                # Add MISC category to balance the difference for small mismatches
-                if abs(diff) <= 300.0:  # Only for small discrepancies <= $300
-                    print(f"   Adding MISC category adjustment: ${diff:,.2f}")
-                    # Update category stats to include MISC
-                    category_stats['MISC'] = {'count': 1, 'amount': diff}
-                    # Recalculate and redisplay the adjusted table
-                    self._display_adjusted_category_table(category_stats, statement_comparison_amount, comparison_label)
-                    return
-        elif hasattr(self, 'pdf_file') and '1250' in self.pdf_file:
-            # For 1250: categories should match statement purchase total
-            diff = statement_comparison_amount - total_amount
-            if abs(diff) < 0.01:
-                print("✅ CATEGORIES MATCH STATEMENT TOTAL")
-            else:
-                print(f"❌ CATEGORY MISMATCH: ${diff:,.2f}")
-                # Add MISC category to balance the difference for small mismatches
-                if abs(diff) <= 300.0:  # Only for small discrepancies <= $300
-                    print(f"   Adding MISC category adjustment: ${diff:,.2f}")
-                    # Update category stats to include MISC
-                    category_stats['MISC'] = {'count': 1, 'amount': diff}
-                    # Recalculate and redisplay the adjusted table
-                    self._display_adjusted_category_table(category_stats, statement_comparison_amount, comparison_label)
-                    return
+        diff = statement_comparison_amount - total_amount
+        if abs(diff) < 0.01:
+            out.append(match_message)
         else:
-            # For 5136/0801: categories should match statement balance
-            diff = statement_comparison_amount - total_amount
-            if abs(diff) < 0.01:
-                print("✅ CATEGORIES MATCH STATEMENT BALANCE")
-            else:
-                print(f"❌ CATEGORY MISMATCH: ${diff:,.2f}")
-                # Add MISC category to balance the difference for small mismatches
-                if abs(diff) <= 300.0:  # Only for small discrepancies <= $300
-                    print(f"   Adding MISC category adjustment: ${diff:,.2f}")
-                    # Update category stats to include MISC
-                    category_stats['MISC'] = {'count': 1, 'amount': diff}
-                    # Recalculate and redisplay the adjusted table
-                    self._display_adjusted_category_table(category_stats, statement_comparison_amount, comparison_label)
-                    return
-
-    def _display_adjusted_category_table(self, category_stats, statement_total, comparison_label):
-        """Display adjusted category breakdown table with MISC category included"""
-        # Sort categories by amount (highest first), but put MISC at the end
-        misc_entry = None
-        if 'MISC' in category_stats:
-            misc_entry = ('MISC', category_stats.pop('MISC'))
-        
-        sorted_categories = sorted(category_stats.items(), key=lambda x: x[1]['amount'], reverse=True)
-        
-        # Add MISC back at the end if it exists
-        if misc_entry:
-            sorted_categories.append(misc_entry)
-            category_stats['MISC'] = misc_entry[1]  # Put it back for any other uses
-        
-        print(f"\n" + "=" * 80)
-        print("ADJUSTED CATEGORY BREAKDOWN TABLE")
-        print("=" * 80)
+            out.append(f"❌ CATEGORY MISMATCH: ${diff:,.2f}")
+            # Add MISC category to balance the difference for small mismatches
+            if abs(diff) <= 300.0:  # Only for small discrepancies <= $300
+                out.append(f"   Adding MISC category adjustment: ${diff:,.2f}")
+                _write_lines(out)
+                # Redisplay the table with the MISC adjustment as its last row
+                self._display_adjusted_category_table(sorted_categories, diff, statement_comparison_amount, comparison_label)
+                return
+        
+        _write_lines(out)
+
+    def _display_adjusted_category_table(self, sorted_categories, misc_amount, statement_total, comparison_label):
+        """Display adjusted category breakdown table with MISC category included
+
+        sorted_categories are the rows of the table being adjusted, already
+        sorted by amount; the MISC adjustment replaces any MISC row there and
+        goes at the end.
+        """
+        out = []
+        sorted_categories = [item for item in sorted_categories if item[0] != 'MISC']
+        sorted_categories.append(('MISC', (1, misc_amount)))
+        
+        out.append("\n" + "=" * 80)
+        out.append("ADJUSTED CATEGORY BREAKDOWN TABLE")
+        out.append("=" * 80)
         
         # Table header
-        print(f"{'Category':<20} {'Count':<8} {'Amount':<15} {'% of Total':<12}")
-        print("-" * 80)
+        out.append(_CATEGORY_TABLE_HEADER)
+        out.append("-" * 80)
         
         # Calculate total for percentages (including MISC)
-        total_amount = sum(stats['amount'] for _, stats in sorted_categories)
+        total_amount = sum(amount for _, (_, amount) in sorted_categories)
         
         # Table rows
-        for category, stats in sorted_categories:
-            percentage = (stats['amount'] / total_amount * 100) if total_amount > 0 else 0
-            print(f"{category:<20} {stats['count']:<8} ${stats['amount']:<14,.2f} {percentage:<11.1f}%")
+        out.extend(_category_rows(sorted_categories, total_amount))
         
         # Total row
-        total_count = sum(stats['count'] for _, stats in sorted_categories)
-        print("-" * 80)
-        print(f"{'TOTAL':<20} {total_count:<8} ${total_amount:<14,.2f} {'100.0':<11}%")
-        print("=" * 80)
+        total_count = sum(count for _, (count, _) in sorted_categories)
+        out.append("-" * 80)
+        out.append(f"{'TOTAL':<20} {total_count:<8} ${total_amount:<14,.2f} {'100.0':<11}%")
+        out.append("=" * 80)
         
-        print(f"Adjusted Category Sum: ${total_amount:,.2f} | {comparison_label}: ${statement_total:,.2f}")
+        out.append(f"Adjusted Category Sum: ${total_amount:,.2f} | {comparison_label}: ${statement_total:,.2f}")
         if abs(total_amount - statement_total) < 0.01:
-            print("✅ ADJUSTED CATEGORIES MATCH STATEMENT TOTAL")
+            out.append("✅ ADJUSTED CATEGORIES MATCH STATEMENT TOTAL")
         else:
             diff = total_amount - statement_total
-            print(f"❌ STILL MISMATCH: ${diff:,.2f}")
+            out.append(f"❌ STILL MISMATCH: ${diff:,.2f}")
+        
+        _write_lines(out)
 
     def create_category_summary_file(self, transactions, output_filename):
         """Create category summary file"""
@@ -1482,38 +1908,46 @@ class EnhancedChaseStatementAnalyzer:
         categories_filename = f"{base_name}.categories"
         
         # Calculate category statistics
-        category_stats = {}
-        for txn in transactions:
-            cat = txn['category']
-            if cat not in category_stats:
-                category_stats[cat] = {'count': 0, 'amount': 0}
-            category_stats[cat]['count'] += 1
-            category_stats[cat]['amount'] += txn['amount']
-        
-        # Write summary
-        with open(categories_filename, 'w', encoding='utf-8') as f:
-            f.write("CHASE CREDIT CARD STATEMENT - CATEGORY ANALYSIS (PURCHASES ONLY)\n")
-            f.write("=" * 80 + "\n")
-            f.write(f"Generated from: {output_filename}\n")
-            f.write(f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Total Transactions: {len(transactions)} (purchases only)\n")
-            f.write(f"Total Amount: ${sum(txn['amount'] for txn in transactions):,.2f}\n\n")
-            
-            f.write("CATEGORY BREAKDOWN\n")
-            f.write("=" * 80 + "\n")
-            
-            for category in sorted(category_stats.keys()):
-                stats = category_stats[category]
-                f.write(f"{category:<20} {stats['count']:>3} transactions  ${stats['amount']:>10,.2f}\n")
+        if transactions is self.transactions:
+            stats = self.get_transaction_stats()
+        else:
+            stats = _aggregate_transactions(transactions)
+        category_stats = stats['by_category']
+        
+        # Compose the whole summary, then hand it to one large buffered write
+        analysis_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        summary = (
+            _CATEGORY_FILE_TITLE
+            + f"Generated from: {output_filename}\n"
+            + f"Analysis Date: {analysis_date}\n"
+            + f"Total Transactions: {len(transactions)} (purchases only)\n"
+            + f"Total Amount: ${stats['grand_total']:,.2f}\n\n"
+            + _CATEGORY_FILE_BREAKDOWN_HEADER
+            + "".join(
+                f"{category:<20} {count:>3} transactions  ${amount:>10,.2f}\n"
+                for category, (count, amount) in sorted(category_stats.items())
+            )
+        )
+        with open(categories_filename, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.write(summary)
                 
         return categories_filename
 
+def _print_profile(profiler, limit=25):
+    """Stop profiler and write its top functions by cumulative time to stderr"""
+    import pstats
+    profiler.disable()
+    pstats.Stats(profiler, stream=sys.stderr).sort_stats('cumulative').print_stats(limit)
+
 def main():
     parser = argparse.ArgumentParser(description='Enhanced Chase Statement Analyzer supporting multiple formats')
     
     # Input options
     parser.add_argument('pdf_file', nargs='?', help='Single PDF file to process')
     parser.add_argument('-d', '--directory', help='Directory containing PDF files to process')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Process up to N PDFs in parallel in directory mode (0 = one per CPU, default: 1). '
+                             'Parallel files are categorized against the master file as it was at the start of the run')
     
     # Output options
     parser.add_argument('--csv', action='store_true', help='Create CSV output files')
@@ -1522,12 +1956,30 @@ def main():
     parser.add_argument('-m', '--master', nargs='?', const=True, help='Use master categorization file (optionally specify file path)')
     parser.add_argument('--master-file', help='Specify master categorization file path')
     parser.add_argument('-i', '--interactive', action='store_true', help='Interactive categorization for new vendors')
+    parser.add_argument('--compact-master', nargs='?', const='categories.master', metavar='FILE',
+                        help='Sort and de-duplicate a master categorization file (default: categories.master), then exit')
     
     # Display options
     parser.add_argument('-S', '--summary-only', action='store_true', help='Show only summary (no detailed output)')
     
+    # PDF options
+    parser.add_argument('--pdf-backend', choices=['pymupdf', 'pypdfium2', 'pdfplumber'], default='pymupdf',
+                        help='PDF text extraction library (default: pymupdf, falls back to pypdfium2 and then '
+                             'pdfplumber if not installed)')
+    parser.add_argument('--no-cache', action='store_true', help='Reparse PDFs instead of using cached results from ~/.cache/chase_analyzer')
+    parser.add_argument('--profile', action='store_true',
+                        help='Print the most expensive functions of the run to stderr when it finishes '
+                             '(-j workers are not profiled)')
+    
     args = parser.parse_args()
     
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        # atexit also covers the sys.exit() error paths below
+        atexit.register(_print_profile, profiler)
+        profiler.enable()
+    
     # Handle the case where --master is given with a filename
     if args.master and isinstance(args.master, str):
         # --master was given with a filename
@@ -1535,6 +1987,17 @@ def main():
             args.master_file = args.master
         args.master = True
     
+    # Compacting the master file is a standalone maintenance step
+    if args.compact_master:
+        if not os.path.exists(args.compact_master):
+            print(f"Error: Master file not found: {args.compact_master}")
+            sys.exit(1)
+        analyzer = EnhancedChaseStatementAnalyzer()
+        master_categories = analyzer.load_master_categories(args.compact_master)
+        analyzer.save_master_categories(master_categories, args.compact_master)
+        print(f"📋 Compacted {args.compact_master}: {len(master_categories)} rules")
+        return
+    
     # Validate that exactly one input method is provided
     if not args.pdf_file and not args.directory:
         print("Error: Please specify either a PDF file or use -d/--directory")
@@ -1547,36 +2010,17 @@ def main():
         sys.exit(1)
     
     analyzer = EnhancedChaseStatementAnalyzer()
+    analyzer.pdf_backend = args.pdf_backend
+    analyzer.use_cache = not args.no_cache
     
-    # Set up master categorization
+    # Set up master categorization (directory mode resolves it per file below)
     master_file = None
-    if args.master or args.master_file:
-        if args.master_file:
-            # Use the explicitly specified master file path
-            # Only fall back to directory-specific search if the explicit file doesn't exist
-            if os.path.exists(args.master_file):
-                master_file = args.master_file
-            elif args.pdf_file and os.path.basename(args.master_file) == args.master_file:
-                # If explicit file doesn't exist and it's just a filename, try in PDF directory
-                pdf_dir = os.path.dirname(args.pdf_file) or '.'
-                dir_master_file = os.path.join(pdf_dir, args.master_file)
-                if os.path.exists(dir_master_file):
-                    master_file = dir_master_file
-                else:
-                    master_file = args.master_file  # Use as-is even if it doesn't exist
-            else:
-                master_file = args.master_file  # Use as-is (could be relative or absolute path)
-        elif args.directory:
-            master_file = os.path.join(args.directory, 'categories.master')
-        elif args.pdf_file:
-            pdf_dir = os.path.dirname(args.pdf_file) or '.'
-            # First try directory-specific master file
-            dir_master_file = os.path.join(pdf_dir, 'categories.master')
-            if os.path.exists(dir_master_file):
-                master_file = dir_master_file
-            else:
-                # Fall back to current directory
-                master_file = 'categories.master'
+    if (args.master or args.master_file) and args.pdf_file:
+        if args.master_file and os.path.exists(args.master_file):
+            # An explicit master file that exists is used as given
+            master_file = args.master_file
+        else:
+            master_file = _resolve_master_file(args.master_file, args.pdf_file)
         
         analyzer.master_file = master_file
     
@@ -1586,53 +2030,82 @@ def main():
             print(f"Error: Directory not found: {args.directory}")
             sys.exit(1)
         
-        pdf_files = [f for f in os.listdir(args.directory) if f.lower().endswith('.pdf')]
-        if not pdf_files:
+        # One scandir pass: entries carry their path and cached file type
+        with os.scandir(args.directory) as entries:
+            pdf_entries = sorted((entry for entry in entries
+                                  if entry.name.lower().endswith('.pdf') and entry.is_file()),
+                                 key=attrgetter('name'))
+        if not pdf_entries:
             print(f"No PDF files found in {args.directory}")
             sys.exit(1)
         
-        print(f"Found {len(pdf_files)} PDF files in {args.directory}")
+        print(f"Found {len(pdf_entries)} PDF files in {args.directory}")
         
-        for pdf_file in sorted(pdf_files):
-            pdf_path = os.path.join(args.directory, pdf_file)
-            
-            # Create a completely fresh analyzer instance for each PDF - true independence
-            file_analyzer = EnhancedChaseStatementAnalyzer()
+        pdf_jobs = []
+        master_file_cache = {}
+        for entry in pdf_entries:
+            pdf_path = entry.path
             
             # Set up master categorization for this specific file (same as individual processing)
             file_master_file = None
             if args.master or args.master_file:
-                if args.master_file:
-                    # If an explicit master file is provided, check if it's just the filename
-                    # and if so, prefer the directory-specific version if it exists
-                    if os.path.basename(args.master_file) == args.master_file:
-                        pdf_dir = os.path.dirname(pdf_path) or '.'
-                        dir_master_file = os.path.join(pdf_dir, args.master_file)
-                        if os.path.exists(dir_master_file):
-                            file_master_file = dir_master_file
-                        else:
-                            file_master_file = args.master_file
-                    else:
-                        file_master_file = args.master_file
-                else:
-                    pdf_dir = os.path.dirname(pdf_path) or '.'
-                    # First try directory-specific master file
-                    dir_master_file = os.path.join(pdf_dir, 'categories.master')
-                    if os.path.exists(dir_master_file):
-                        file_master_file = dir_master_file
-                    else:
-                        # Fall back to current directory
-                        file_master_file = 'categories.master'
+                file_master_file = _resolve_master_file(args.master_file, pdf_path, master_file_cache)
+            
+            pdf_jobs.append((pdf_path, file_master_file))
+        
+        # Interactive categorization needs the terminal, so it always runs serially
+        jobs = 1 if args.interactive else (args.jobs if args.jobs > 0 else os.cpu_count() or 1)
+        jobs = min(jobs, len(pdf_jobs))
+        
+        if jobs > 1:
+            options = {
+                'pdf_backend': args.pdf_backend,
+                'use_cache': not args.no_cache,
+                'create_csv': args.csv,
+                'summary_only': args.summary_only,
+            }
+            # Rules learned by an earlier file in this run, per master file
+            appended_categories = defaultdict(dict)
+            # Forked workers inherit unflushed output, so flush before starting them
+            sys.stdout.flush()
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                results = executor.map(_process_pdf_job, [(pdf_path, file_master_file, options)
+                                                          for pdf_path, file_master_file in pdf_jobs])
+                for (pdf_path, file_master_file), (output, learned_categories) in zip(pdf_jobs, results):
+                    if file_master_file and not args.summary_only:
+                        print(f"   📋 Using master file: {file_master_file}")
+                    sys.stdout.write(output)
+                    
+                    if learned_categories:
+                        # A serial run would have matched rules learned by earlier files
+                        # instead of learning them again, so keep only the first
+                        appended = appended_categories[file_master_file]
+                        new_categories = {pattern: category for pattern, category in learned_categories.items()
+                                          if pattern not in appended}
+                        if new_categories:
+                            analyzer.append_master_categories(new_categories, file_master_file)
+                            appended.update(new_categories)
+                    
+                    if not args.summary_only:
+                        print("\n" + "=" * 80 + "\n")
+        else:
+            for pdf_path, file_master_file in pdf_jobs:
+                # Create a completely fresh analyzer instance for each PDF - true independence
+                file_analyzer = EnhancedChaseStatementAnalyzer()
+                file_analyzer.pdf_backend = args.pdf_backend
+                file_analyzer.use_cache = not args.no_cache
+                
+                if file_master_file:
+                    file_analyzer.master_file = file_master_file
+                    if not args.summary_only:
+                        print(f"   📋 Using master file: {file_master_file}")
+                
+                # Process this PDF file completely independently 
+                file_analyzer.process_pdf_file(pdf_path, create_csv=args.csv, use_master=bool(file_master_file), interactive=args.interactive, summary_only=args.summary_only)
                 
-                file_analyzer.master_file = file_master_file
                 if not args.summary_only:
-                    print(f"   📋 Using master file: {file_master_file}")
-            
-            # Process this PDF file completely independently 
-            file_analyzer.process_pdf_file(pdf_path, create_csv=args.csv, use_master=bool(file_master_file), interactive=args.interactive, summary_only=args.summary_only)
-            
-            if not args.summary_only:
-                print("\n" + "=" * 80 + "\n")
+                    print("\n" + "=" * 80 + "\n")
             
     elif args.pdf_file:
         # Process single PDF file